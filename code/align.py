@@ -0,0 +1,316 @@
+"""Put instruments logged on different clocks onto one target clock.
+
+The SHS comparisons mix the RBR (3 s), the WXT520 (1 min records, 5 s wind
+samples), the tank GPCTD (1 Hz) and the Sentinel (hourly).  ``align`` takes
+any number of time-indexed sources and returns their values at the target
+times, one source at a time, working on sorted int64-nanosecond time arrays:
+
+``"nearest"``
+    as-of join (``pd.merge_asof``) to the closest source sample within
+    ``tolerance`` (an unsorted target is sorted for the join and the rows
+    put back in its order);
+``"linear"``
+    linear interpolation between the source samples either side of each
+    target time, if both are within ``tolerance``;
+``"mean"``
+    block average of the source samples in ``[t - window/2, t + window/2)``
+    around each target time, from cumulative sums indexed by
+    ``searchsorted`` (no intermediate resampled frame).
+
+Each is O((N + M) log N) for N source and M target samples.  Target times
+with no source sample in reach get NaN.
+
+The instrument clocks are independent, and the SHS probes also lag the
+tank reference thermally.  ``clock_offset`` estimates the time offset and
+linear drift of one series against another from FFT cross-correlations over
+sliding windows, and ``align(..., offsets=...)`` removes it from a source's
+timestamps before the join.
+
+Example::
+
+    comp = wxt.join(align(wxt.index, {"psy": psy}, tolerance="5s"))
+
+    off = clock_offset(wxt["atmp"], psy["T_dry_C"], step="1min", window="6h")
+    comp = wxt.join(align(wxt.index, {"psy": psy}, offsets={"psy": off}))
+"""
+from __future__ import annotations
+
+from typing import Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from segment_stats import block_average
+
+
+METHODS = ("nearest", "linear", "mean")
+
+
+def _ns(index) -> np.ndarray:
+    return pd.DatetimeIndex(index).as_unit("ns").asi8
+
+
+def _as_frame(name: str, source) -> pd.DataFrame:
+    if isinstance(source, pd.Series):
+        frame = source.to_frame(name)
+    else:
+        frame = source.add_prefix(f"{name}_")
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    return frame
+
+
+def _nearest(t: np.ndarray, frame: pd.DataFrame, tolerance: int) -> pd.DataFrame:
+    left = pd.DataFrame({"_t": t})
+    right = frame.reset_index(drop=True)
+    right.insert(0, "_t", _ns(frame.index))
+    out = pd.merge_asof(left, right, on="_t", direction="nearest",
+                        tolerance=tolerance)
+    return out.drop(columns="_t")
+
+
+def _linear(t: np.ndarray, frame: pd.DataFrame, tolerance: int) -> pd.DataFrame:
+    ts = _ns(frame.index)
+    x = frame.to_numpy(dtype=float)
+    prev = np.searchsorted(ts, t, side="right") - 1
+    nxt = np.searchsorted(ts, t, side="left")
+    ok = (prev >= 0) & (nxt < len(ts))
+    p, n = np.where(ok, prev, 0), np.where(ok, nxt, 0)
+    ok &= (t - ts[p] <= tolerance) & (ts[n] - t <= tolerance)
+    span = (ts[n] - ts[p]).astype(float)
+    w = np.divide(t - ts[p], span, out=np.zeros(len(t)), where=span > 0)
+    y = x[p] + w[:, None] * (x[n] - x[p])
+    y[~ok] = np.nan
+    return pd.DataFrame(y, columns=frame.columns)
+
+
+def _mean(t: np.ndarray, frame: pd.DataFrame, window: int) -> pd.DataFrame:
+    ts = _ns(frame.index)
+    x = frame.to_numpy(dtype=float)
+    ok = np.isfinite(x)
+    zero = np.zeros((1, x.shape[1]))
+    c_n = np.concatenate([zero, np.cumsum(ok, axis=0)])
+    c_x = np.concatenate([zero, np.cumsum(np.where(ok, x, 0.0), axis=0)])
+    lo = np.searchsorted(ts, t - window // 2, side="left")
+    hi = np.searchsorted(ts, t + (window - window // 2), side="left")
+    n = c_n[hi] - c_n[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y = (c_x[hi] - c_x[lo]) / n
+    return pd.DataFrame(y, columns=frame.columns)
+
+
+def xcorr_lag(a: np.ndarray, b: np.ndarray, max_lag: int | None = None,
+              min_overlap: int | None = None) -> tuple[float, float]:
+    """Lag of ``b`` behind ``a`` (in samples, ``b[i + lag] ~ a[i]``) at the
+    peak of their cross-correlation, and the peak value.
+
+    Both are equal-length, regularly sampled arrays.  At each lag the
+    correlation is the Pearson coefficient over the pairs that overlap at
+    that lag and are both finite, so it is not shrunk at large lags by the
+    zero padding.  The sums it needs are computed for all lags at once with
+    zero-padded real FFTs (O(n log n)), and the peak is refined to a
+    fraction of a sample with a parabola through its neighbours.
+    ``max_lag`` limits the search; lags with fewer than ``min_overlap``
+    pairs (default half the length) are left out.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n = len(a)
+    if n < 3:
+        return np.nan, np.nan
+    ma = np.isfinite(a).astype(float)
+    mb = np.isfinite(b).astype(float)
+    if not ma.any() or not mb.any():
+        return np.nan, np.nan
+    # centre first: the sums of squares below then lose less to rounding
+    a = np.where(ma > 0, a - np.nanmean(a), 0.0)
+    b = np.where(mb > 0, b - np.nanmean(b), 0.0)
+
+    nfft = 1 << (2 * n - 1).bit_length()
+    max_lag = n - 1 if max_lag is None else min(int(max_lag), n - 1)
+    A = [np.fft.rfft(x, nfft) for x in (ma, a, a * a)]
+    B = [np.fft.rfft(x, nfft) for x in (mb, b, b * b)]
+
+    def xsum(x, y):
+        # sum_i x[i] y[i + lag] for lags -max_lag .. max_lag, in order
+        c = np.fft.irfft(np.conj(x) * y, nfft)
+        return np.r_[c[nfft - max_lag:], c[:max_lag + 1]]
+
+    count = np.rint(xsum(A[0], B[0]))
+    sa, sb = xsum(A[1], B[0]), xsum(A[0], B[1])
+    saa, sbb = xsum(A[2], B[0]), xsum(A[0], B[2])
+    sab = xsum(A[1], B[1])
+    min_overlap = max(3, n // 2 if min_overlap is None else int(min_overlap))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (count * saa - sa * sa) * (count * sbb - sb * sb)
+        cc = (count * sab - sa * sb) / np.sqrt(var)
+    cc[(count < min_overlap) | ~(var > 0)] = np.nan
+    if np.isnan(cc).all():
+        return np.nan, np.nan
+    k = int(np.nanargmax(cc))
+    frac = 0.0
+    if 0 < k < len(cc) - 1 and np.isfinite(cc[[k - 1, k + 1]]).all():
+        y0, y1, y2 = cc[k - 1], cc[k], cc[k + 1]
+        denom = y0 - 2 * y1 + y2
+        if denom < 0:
+            frac = 0.5 * (y0 - y2) / denom
+    return k - max_lag + frac, float(cc[k])
+
+
+class ClockOffset(NamedTuple):
+    """Time offset of one series against a reference, ``offset + drift *
+    (t - t0)`` seconds (positive: the series is late), and the sliding-window
+    estimates it was fitted to."""
+
+    t0: pd.Timestamp
+    offset: float  # s at t0
+    drift: float  # s per s
+    times: pd.DatetimeIndex  # window centres
+    lags: np.ndarray  # s
+    corr: np.ndarray
+
+    def lag_at(self, times) -> np.ndarray:
+        """Offset in seconds at each of ``times``."""
+        dt = (pd.DatetimeIndex(times) - self.t0).total_seconds()
+        return self.offset + self.drift * np.asarray(dt)
+
+    def correct(self, times) -> pd.DatetimeIndex:
+        """``times`` of the offset series moved onto the reference clock."""
+        times = pd.DatetimeIndex(times)
+        return times - pd.to_timedelta(self.lag_at(times), unit="s")
+
+
+def clock_offset(
+    ref: pd.Series,
+    other: pd.Series,
+    step="1min",
+    window="6h",
+    stride=None,
+    max_lag="30min",
+    min_corr: float = 0.5,
+    diff: bool = False,
+    fit_drift: bool = True,
+) -> ClockOffset:
+    """Estimate the clock offset and drift of ``other`` against ``ref``.
+
+    Both series are block-averaged onto a common ``step`` grid
+    (``segment_stats.block_average``), the overlap is cut into ``window``
+    long pieces every ``stride`` (default half a window), and the lag of
+    each piece is found with ``xcorr_lag``.  With ``diff`` the first
+    differences are correlated instead, which suits random-walk-like series
+    whose slow trends would otherwise flatten the correlation peak (but
+    amplifies noise on short records).  A straight line is then fitted to the
+    lags of the windows correlating better than ``min_corr`` (weighted by the
+    correlation), giving an offset at the middle of the overlap and a drift;
+    without ``fit_drift``, or with fewer than two good windows, the offset is
+    the median lag and the drift 0.
+
+    The lag includes any response time of the sensors as well as the clock
+    difference, e.g. the thermal lag of an SHS probe behind the tank CTD.
+
+    Returns
+    -------
+    ClockOffset; ``ClockOffset.correct`` (or ``align(..., offsets=...)``)
+    moves ``other``'s timestamps onto ``ref``'s clock.
+    """
+    step = pd.Timedelta(step)
+    a = block_average(ref.index, ref.to_numpy(dtype=float), step).frame()["x0"]
+    b = block_average(other.index, other.to_numpy(dtype=float), step).frame()["x0"]
+    grid = a.index.intersection(b.index)
+    if len(grid) < 4:
+        raise ValueError("the two series do not overlap")
+    grid = pd.date_range(grid[0], grid[-1], freq=step)
+    a = a.reindex(grid).to_numpy()
+    b = b.reindex(grid).to_numpy()
+    if diff:
+        a, b, grid = np.diff(a), np.diff(b), grid[1:]
+
+    n_win = int(np.clip(pd.Timedelta(window) // step, 3, len(grid)))
+    n_stride = n_win // 2 if stride is None else pd.Timedelta(stride) // step
+    max_lag_n = int(pd.Timedelta(max_lag) // step)
+    starts = np.arange(0, len(grid) - n_win + 1, max(1, int(n_stride)))
+    lags = np.empty(len(starts))
+    corr = np.empty(len(starts))
+    for i, i0 in enumerate(starts):
+        lag, c = xcorr_lag(a[i0:i0 + n_win], b[i0:i0 + n_win], max_lag_n)
+        lags[i], corr[i] = lag * step.total_seconds(), c
+    centres = grid[starts] + (n_win - 1) * step / 2
+
+    t0 = grid[0] + (grid[-1] - grid[0]) / 2
+    good = np.isfinite(lags) & (corr >= min_corr)
+    x = np.asarray((centres - t0).total_seconds())
+    if fit_drift and good.sum() >= 2 and np.ptp(x[good]) > 0:
+        drift, offset = np.polyfit(x[good], lags[good], 1, w=corr[good])
+    elif good.any():
+        drift, offset = 0.0, float(np.median(lags[good]))
+    else:
+        raise ValueError(f"no window correlates better than {min_corr}")
+    return ClockOffset(t0, float(offset), float(drift), centres, lags, corr)
+
+
+def align(
+    target,
+    sources: Mapping[str, pd.DataFrame | pd.Series],
+    tolerance="5s",
+    method: str | Mapping[str, str] = "nearest",
+    window=None,
+    offsets: Mapping[str, ClockOffset] | None = None,
+) -> pd.DataFrame:
+    """Values of every source at the ``target`` times.
+
+    Parameters
+    ----------
+    target : DatetimeIndex (or a time-indexed frame, whose index is used);
+        it need not be sorted.
+    sources : name -> time-indexed DataFrame or Series.  DataFrame columns
+        come back as ``<name>_<column>``, a Series as ``<name>``.
+    tolerance : furthest a source sample may be from a target time for
+        ``"nearest"`` and ``"linear"``.
+    method : ``"nearest"``, ``"linear"`` or ``"mean"``, or a mapping of
+        source name to method (missing names use ``"nearest"``).
+    window : averaging width for ``"mean"`` (default: the median target
+        spacing).
+    offsets : source name -> ``ClockOffset`` of that source against the
+        target's clock, removed from the source timestamps before aligning.
+
+    Returns
+    -------
+    DataFrame indexed by ``target`` with the aligned columns of all sources.
+    """
+    if isinstance(target, (pd.DataFrame, pd.Series)):
+        target = target.index
+    target = pd.DatetimeIndex(target)
+    t = _ns(target)
+    # the joins work on sorted target times; rows go back in target order
+    order = None
+    if np.any(t[1:] < t[:-1]):
+        order = np.argsort(t, kind="stable")
+        t = t[order]
+    tol = int(pd.Timedelta(tolerance).value)
+    if window is None:
+        window = np.median(np.diff(t)) if len(t) > 1 else tol
+    win = int(pd.Timedelta(window).value)
+
+    parts = []
+    for name, source in sources.items():
+        how = method.get(name, "nearest") if isinstance(method, Mapping) else method
+        if how not in METHODS:
+            raise ValueError(f"unknown method {how!r} for {name!r}; "
+                             f"expected one of {METHODS}")
+        frame = _as_frame(name, source)
+        if offsets and name in offsets:
+            frame.index = offsets[name].correct(frame.index)
+            frame = frame.sort_index()
+        if how == "nearest":
+            parts.append(_nearest(t, frame, tol))
+        elif how == "linear":
+            parts.append(_linear(t, frame, tol))
+        else:
+            parts.append(_mean(t, frame, win))
+    out = pd.concat(parts, axis=1) if parts else pd.DataFrame(index=range(len(t)))
+    if order is not None:
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        out = out.iloc[inverse]
+    out.index = target
+    return out
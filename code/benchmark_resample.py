@@ -0,0 +1,103 @@
+"""Time ``segment_stats.block_average`` against pandas ``resample``.
+
+The test record is a synthetic 1 Hz multi-column series (``--days`` long,
+``--columns`` wide, a few percent NaN and a few dropped seconds, like the
+tank and WXT logs) plus the real tank GPCTD logs.  Each is averaged onto the
+3 s RBR grid with pandas -- ``.mean()`` plus ``.std(ddof=0)``, and
+``.agg(["count", "sum", "mean", "std"])``, which is what ``block_average``
+returns -- and with ``block_average``; the means and standard deviations are
+checked against each other.
+
+``block_average`` is not faster than pandas' own ``mean()`` / ``std()``
+(single-pass Cython group reductions) on a long record: on one core the
+7-day record runs at roughly 0.7-0.9x of them.  What it saves is the
+``agg`` call when count, sum, mean and std are all wanted (about 2x on the
+long record, 4-5x on the tank logs).
+
+Usage:
+    python benchmark_resample.py [--days N] [--columns N] [--freq 3s] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from segment_stats import block_average
+from tank_log import load_tank_ct
+
+
+REPO = Path(__file__).resolve().parents[1]
+TANK_LOGS = [
+    REPO / "data/20260520Lab/tank/20260520_CT_tank_log_EGH",
+    REPO / "data/20260528Lab/tank_CT/20260528_tank_CT_log_EGH",
+]
+
+
+def _synthetic(days: float, columns: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = int(days * 86400)
+    t = pd.Timestamp("2026-05-28") + pd.to_timedelta(np.arange(n), unit="s")
+    keep = rng.random(n) > 0.01  # dropped samples
+    x = rng.normal(size=(n, columns)).cumsum(axis=0)
+    x[rng.random((n, columns)) < 0.02] = np.nan
+    return pd.DataFrame(x[keep], index=t[keep],
+                        columns=[f"x{i}" for i in range(columns)])
+
+
+def _pandas(df: pd.DataFrame, freq: str):
+    r = df.resample(freq)
+    return r.mean(), r.std(ddof=0)
+
+
+def _pandas_agg(df: pd.DataFrame, freq: str):
+    return df.resample(freq).agg(["count", "sum", "mean", "std"])
+
+
+def _blocks(df: pd.DataFrame, freq: str):
+    b = block_average(df.index, df, freq)
+    return b.frame("mean"), b.frame("std")
+
+
+def _best_time(func, df, freq, repeat):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func(df, freq)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=float, default=7.0)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--freq", default="3s")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    cases = [(f"synthetic {args.days:g} d x {args.columns}",
+              _synthetic(args.days, args.columns))]
+    cases += [(p.name, load_tank_ct(p)) for p in TANK_LOGS if p.exists()]
+
+    print(f"{'record':<32s} {'N':>9s} {'mean+std':>9s} {'agg':>9s} "
+          f"{'blocks':>9s} {'speedup':>13s} {'match':>6s}")
+    for name, df in cases:
+        ref_s, (ref_mean, ref_std) = _best_time(_pandas, df, args.freq, args.repeat)
+        agg_s, _ = _best_time(_pandas_agg, df, args.freq, args.repeat)
+        new_s, (mean, std) = _best_time(_blocks, df, args.freq, args.repeat)
+        match = (mean.index.equals(ref_mean.index)
+                 and np.allclose(mean, ref_mean, equal_nan=True)
+                 and np.allclose(std, ref_std, equal_nan=True))
+        speedup = f"{ref_s / new_s:.1f}x / {agg_s / new_s:.1f}x"
+        print(f"{name:<32s} {len(df):9d} {ref_s:9.3f} {agg_s:9.3f} "
+              f"{new_s:9.3f} {speedup:>13s} {str(match):>6s}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
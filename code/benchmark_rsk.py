@@ -0,0 +1,82 @@
+"""Time ``rbr_rsk.RSK`` against ``pyrsktools.RSK`` on the same .rsk files.
+
+For each file both readers run ``open`` + ``readdata`` + ``close`` and the
+samples are checked against each other (channel names differ slightly between
+the two: ``temperature1`` here vs ``temperature2`` in pyrsktools, so the
+comparison is positional).  If ``pyrsktools`` is not installed only the fast
+reader is timed.
+
+Usage:
+    python benchmark_rsk.py [file.rsk ...] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from rbr_rsk import RSK
+
+
+REPO = Path(__file__).resolve().parents[1]
+DEFAULT_FILES = sorted(
+    p for p in (REPO / "data").glob("20*/**/*.rsk") if "SHS" not in p.parts
+)
+
+
+def _read(cls, path: Path) -> np.ndarray:
+    with cls(str(path)) as rsk:
+        rsk.readdata()
+        return rsk.data
+
+
+def _best_time(cls, path: Path, repeat: int) -> tuple[float, np.ndarray]:
+    best = np.inf
+    data = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        data = _read(cls, path)
+        best = min(best, time.perf_counter() - t0)
+    return best, data
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", type=Path, nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        from pyrsktools import RSK as PyRSK
+    except ImportError:
+        PyRSK = None
+    import_s = time.perf_counter() - t0
+    if PyRSK is None:
+        print("pyrsktools not installed; timing rbr_rsk.RSK only")
+    else:
+        print(f"pyrsktools import: {import_s:.3f} s")
+
+    print(f"{'file':<32s} {'N':>8s} {'fast (s)':>9s} {'pyrsk (s)':>9s} "
+          f"{'speedup':>8s} {'match':>6s}")
+    for path in args.files:
+        fast_s, fast = _best_time(RSK, path, args.repeat)
+        line = f"{path.name:<32s} {len(fast):8d} {fast_s:9.4f}"
+        if PyRSK is not None:
+            ref_s, ref = _best_time(PyRSK, path, args.repeat)
+            match = len(ref) == len(fast) and bool(
+                np.array_equal(ref["timestamp"], fast["timestamp"])
+                and all(
+                    np.allclose(ref[a], fast[b], equal_nan=True)
+                    for a, b in zip(ref.dtype.names[1:], fast.dtype.names[1:])
+                )
+            )
+            line += f" {ref_s:9.4f} {ref_s / fast_s:7.1f}x {str(match):>6s}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
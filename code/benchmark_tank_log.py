@@ -0,0 +1,97 @@
+"""Time ``tank_log.load_tank_ct`` against the old per-line regex parser.
+
+Each tank log is also tiled ``--tile`` times into a temporary file so the
+comparison covers multi-day logs (a 1 Hz log is ~86k lines per day), and the
+chunked reader (``iter_tank_ct``) is timed on the same data.  The frames are
+checked against each other.
+
+Usage:
+    python benchmark_tank_log.py [log ...] [--tile N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from tank_log import iter_tank_ct, load_tank_ct
+
+
+REPO = Path(__file__).resolve().parents[1]
+DEFAULT_FILES = [
+    REPO / "data/20260520Lab/tank/20260520_CT_tank_log_EGH",
+    REPO / "data/20260528Lab/tank_CT/20260528_tank_CT_log_EGH",
+]
+
+
+def _regex_reader(path: Path) -> pd.DataFrame:
+    """The line-by-line parser previously copied into the compare scripts."""
+    pat = re.compile(
+        r"\[(?P<t>[0-9\-]+ [0-9:.]+)\]\s+"
+        r"(?P<p>[-0-9.]+),\s+(?P<T>[-0-9.]+),\s+(?P<C>[-0-9.]+)"
+    )
+    times, p, T, C = [], [], [], []
+    with path.open() as f:
+        for line in f:
+            m = pat.match(line)
+            if not m:
+                continue
+            times.append(m["t"])
+            p.append(float(m["p"]))
+            T.append(float(m["T"]))
+            C.append(float(m["C"]))
+    df = pd.DataFrame(
+        {"p_dbar": p, "T_C": T, "C_Sm": C}, index=pd.to_datetime(times)
+    )
+    df.index.name = "time"
+    return df
+
+
+def _chunked(path: Path) -> pd.DataFrame:
+    return pd.concat(list(iter_tank_ct(path)))
+
+
+def _best_time(func, path: Path, repeat: int) -> tuple[float, pd.DataFrame]:
+    best = float("inf")
+    df = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = func(path)
+        best = min(best, time.perf_counter() - t0)
+    return best, df
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", type=Path, nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--tile", type=int, default=20,
+                        help="copies of each log in the multi-day test file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'file':<34s} {'N':>8s} {'regex (s)':>9s} {'fast (s)':>9s} "
+          f"{'chunked':>9s} {'speedup':>8s} {'match':>6s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = []
+        for path in args.files:
+            cases.append((path.name, path))
+            tiled = Path(tmp) / f"{path.name}_x{args.tile}"
+            tiled.write_bytes(path.read_bytes() * args.tile)
+            cases.append((tiled.name, tiled))
+
+        for name, path in cases:
+            ref_s, ref = _best_time(_regex_reader, path, args.repeat)
+            fast_s, fast = _best_time(load_tank_ct, path, args.repeat)
+            chunk_s, chunk = _best_time(_chunked, path, args.repeat)
+            match = ref.equals(fast) and fast.equals(chunk)
+            print(f"{name:<34s} {len(fast):8d} {ref_s:9.3f} {fast_s:9.3f} "
+                  f"{chunk_s:9.3f} {ref_s / fast_s:7.1f}x {str(match):>6s}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
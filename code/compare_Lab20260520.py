@@ -20,7 +20,6 @@ Outputs:
 """
 from __future__ import annotations
 
-import re
 from pathlib import Path
 
 import numpy as np
@@ -28,41 +27,16 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
-from vapo_sat_Lab20260520 import NOTES, DAY
+from align import align
+from decode_wxt520_sd import load_wxt
+from segment_stats import block_average
+from shs_notes import load_notes
+from tank_log import load_tank_ct
 
 
+NOTES = load_notes("20260520Lab")
 # in-water windows from the notes (start IN -> next OUT)
-IN_OUT = [
-    ("14:26", "14:33", "IN-1"),
-    ("15:07", "15:18", "IN-2"),
-    ("15:48", "15:53", "IN-3"),
-    ("17:02", "17:08", "IN-4"),
-    ("19:18", "19:25", "IN-5"),
-]
-
-
-def load_tank_ct(path: Path) -> pd.DataFrame:
-    """Parse the Seabird GPCTD bench log:
-        [YYYY-MM-DD HH:MM:SS.fff]  pressure_dbar, temp_C, cond_S/m
-    """
-    pat = re.compile(
-        r"\[(?P<t>[0-9\-]+ [0-9:.]+)\]\s+"
-        r"(?P<p>[-0-9.]+),\s+(?P<T>[-0-9.]+),\s+(?P<C>[-0-9.]+)"
-    )
-    times, p, T, C = [], [], [], []
-    with path.open() as f:
-        for line in f:
-            m = pat.match(line)
-            if not m:
-                continue
-            times.append(m["t"])
-            p.append(float(m["p"]))
-            T.append(float(m["T"]))
-            C.append(float(m["C"]))
-    df = pd.DataFrame({"p_dbar": p, "T_C": T, "C_Sm": C},
-                      index=pd.to_datetime(times))
-    df.index.name = "time"
-    return df
+IN_OUT = NOTES.intervals("water")
 
 
 def main():
@@ -81,10 +55,10 @@ def main():
     ct = load_tank_ct(ct_log)
     print(f"Tank GPCTD samples       : {len(ct)} "
           f"({ct.index.min()} → {ct.index.max()})")
-    ct3 = ct["T_C"].resample("3s").mean()
+    ct3 = block_average(ct.index, ct["T_C"], "3s").frame()["T_C"]
 
-    wxt = pd.read_csv(wxt_csv, parse_dates=["time"]).set_index("time")
-    ptu_dead = bool((wxt[["atmp", "hrh", "bpr"]].abs().sum().sum()) == 0)
+    wxt = load_wxt(wxt_csv)
+    ptu_dead = bool(wxt["qc_ptu_zero"].all())
     print(f"WXT520 records           : {len(wxt)} "
           f"({wxt.index.min()} → {wxt.index.max()})  "
           f"{'PTU sensor not reporting (atmp=hrh=bpr=0)' if ptu_dead else 'PTU OK'}")
@@ -95,10 +69,11 @@ def main():
           f"{'T_dry':>8s} {'T_wet':>8s} "
           f"{'Td-Tt':>8s} {'Tw-Tt':>8s}")
     rows = []
-    ct_on_shs = ct3.reindex(shs.index, method="nearest", tolerance="3s")
-    for h0, h1, lbl in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    # tank T block-averaged over the 3 s around each SHS sample
+    ct_on_shs = align(shs.index, {"T_tank": ct["T_C"]},
+                      method="mean", window="3s")["T_tank"]
+    for t0, t1, _, lbl in IN_OUT:
+        h0, h1 = t0.strftime("%H:%M"), t1.strftime("%H:%M")
         s = shs.loc[t0:t1]
         c = ct_on_shs.loc[t0:t1]
         if s.empty or c.dropna().empty:
@@ -140,9 +115,7 @@ def main():
     # ΔT (SHS − tank) only during in-water windows
     diff_dry = np.full(len(shs), np.nan)
     diff_wet = np.full(len(shs), np.nan)
-    for h0, h1, _ in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    for t0, t1, _, _ in IN_OUT:
         sel = (shs.index >= t0) & (shs.index <= t1)
         diff_dry[sel] = (shs["T_dry_C"].values[sel]
                          - ct_on_shs.values[sel])
@@ -180,15 +153,12 @@ def main():
              bbox=dict(facecolor="white", edgecolor="0.7", alpha=0.9))
 
     color_for = {"IN": "tab:blue", "OUT": "tab:orange",
-                 "fan-on/OUT": "tab:red", "start": "k", "OFF": "k"}
-    for h, kind in NOTES:
-        ts = pd.Timestamp(f"{DAY} {h}")
+                 "start": "k", "OFF": "k"}
+    for ts, kind in zip(NOTES.times, NOTES.kinds):
         c = color_for.get(kind, "gray")
         for ax in axs:
             ax.axvline(ts, color=c, ls="--", lw=0.5, alpha=0.5)
-    for h0, h1, _ in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    for t0, t1, _, _ in IN_OUT:
         for ax in axs:
             ax.axvspan(t0, t1, color="C0", alpha=0.08, zorder=0)
 
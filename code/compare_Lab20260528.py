@@ -9,10 +9,15 @@ Inputs:
 Outputs:
   - data/20260528Lab/compare_SHS_tank_20260528.csv
   - img/Lab20260528/Lab20260528_SHS_vs_tank.png
+
+With ``--live`` the tank log is instead followed as it is written (asyncio
+tail into a ``tank_log.TankBuffer``) and the running SHS - tank difference is
+printed every poll, so the reference can be watched during a test.
 """
 from __future__ import annotations
 
-import re
+import argparse
+import asyncio
 from pathlib import Path
 
 import matplotlib.dates as mdates
@@ -20,47 +25,73 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
-from vapo_sat_Lab20260528 import DAY, NOTES, note_time
-
-
-IN_OUT = [
-    ("13:11", "13:27", "IN-1"),
-    ("13:56", "14:01", "IN-2"),
-    ("14:56", "15:01", "IN-3"),
-    ("15:42", "15:49", "IN-4"),
-    ("16:30", "16:34", "IN-5"),
-    ("18:30", "18:50", "IN-6"),
-]
-
-
-def load_tank_ct(path: Path) -> pd.DataFrame:
-    """Parse the Seabird GPCTD bench log."""
-    pat = re.compile(
-        r"\[(?P<t>[0-9\-]+ [0-9:.]+)\]\s+"
-        r"(?P<p>[-0-9.]+),\s+(?P<T>[-0-9.]+),\s+(?P<C>[-0-9.]+)"
-    )
-    times, p, T, C = [], [], [], []
-    with path.open() as f:
-        for line in f:
-            m = pat.match(line)
-            if not m:
+from align import align
+from decode_wxt520_sd import load_wxt
+from segment_stats import block_average
+from shs_notes import load_notes
+from tank_log import TankBuffer, follow_tank_log, load_tank_ct
+
+
+NOTES = load_notes("20260528Lab")
+IN_OUT = NOTES.intervals("water")
+
+
+async def live_compare(
+    ct_log: Path,
+    shs: pd.DataFrame,
+    poll: float = 1.0,
+    seconds: float | None = None,
+    window: str = "60s",
+) -> TankBuffer:
+    """Follow the tank log and print the SHS - tank difference as it grows.
+
+    Each poll the last ``window`` of tank samples is averaged and compared
+    with the SHS samples over the same interval.  Runs for ``seconds`` (or
+    until interrupted) and returns the buffer.
+    """
+    buf = TankBuffer()
+    stop = asyncio.Event()
+    follower = asyncio.create_task(follow_tank_log(ct_log, buf, poll, stop))
+    loop = asyncio.get_running_loop()
+    t_stop = None if seconds is None else loop.time() + seconds
+    print(f"{'tank time':<24s} {'N':>5s} {'T_tank':>8s} "
+          f"{'Td-Tt':>8s} {'Tw-Tt':>8s}")
+    try:
+        while t_stop is None or loop.time() < t_stop:
+            await asyncio.sleep(poll)
+            last = buf.latest()
+            if last is None:
                 continue
-            times.append(m["t"])
-            p.append(float(m["p"]))
-            T.append(float(m["T"]))
-            C.append(float(m["C"]))
-    df = pd.DataFrame(
-        {"p_dbar": p, "T_C": T, "C_Sm": C}, index=pd.to_datetime(times)
-    )
-    df.index.name = "time"
-    return df
+            t1 = last.name
+            t0 = t1 - pd.Timedelta(window)
+            Tt = float(buf.frame(t0, t1)["T_C"].mean())
+            s = shs.loc[t0:t1]
+            Td = float(s["T_dry_C"].mean()) if len(s) else np.nan
+            Tw = float(s["T_wet_C"].mean()) if len(s) else np.nan
+            print(f"{str(t1):<24s} {len(buf):5d} {Tt:8.3f} "
+                  f"{Td - Tt:+8.3f} {Tw - Tt:+8.3f}")
+    finally:
+        stop.set()
+        await follower
+    return buf
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--live", action="store_true",
+                        help="follow the tank log instead of the offline comparison")
+    parser.add_argument("--poll", type=float, default=1.0,
+                        help="seconds between tank-log reads in --live mode")
+    parser.add_argument("--seconds", type=float, default=None,
+                        help="stop --live after this many seconds")
+    parser.add_argument("--ct-log", type=Path, default=None,
+                        help="tank log to follow (default: the 2026-05-28 log)")
+    args = parser.parse_args(argv)
 
-
-def main() -> None:
     here = Path(__file__).resolve().parent
     root = here / ".."
     shs_csv = root / "data/20260528Lab/RBR/psychrometrics_20260528.csv"
-    ct_log = root / "data/20260528Lab/tank_CT/20260528_tank_CT_log_EGH"
+    ct_log = args.ct_log or root / "data/20260528Lab/tank_CT/20260528_tank_CT_log_EGH"
     wxt_csv = root / "data/20260528Lab/WXT/processed/ASWXT203.csv"
     img_dir = root / "img/Lab20260528"
     img_dir.mkdir(parents=True, exist_ok=True)
@@ -68,15 +99,22 @@ def main() -> None:
     shs = pd.read_csv(shs_csv, parse_dates=["time"]).set_index("time")
     print(f"SHS psychrometric samples : {len(shs)}")
 
+    if args.live:
+        try:
+            asyncio.run(live_compare(ct_log, shs, args.poll, args.seconds))
+        except KeyboardInterrupt:
+            pass
+        return
+
     ct = load_tank_ct(ct_log)
     print(
         f"Tank GPCTD samples       : {len(ct)} "
         f"({ct.index.min()} -> {ct.index.max()})"
     )
-    ct3 = ct["T_C"].resample("3s").mean()
+    ct3 = block_average(ct.index, ct["T_C"], "3s").frame()["T_C"]
 
-    wxt = pd.read_csv(wxt_csv, parse_dates=["time"]).set_index("time")
-    ptu_dead = bool((wxt[["atmp", "hrh", "bpr"]].abs().sum().sum()) == 0)
+    wxt = load_wxt(wxt_csv)
+    ptu_dead = bool(wxt["qc_ptu_zero"].all())
     print(
         f"WXT520 records           : {len(wxt)} "
         f"({wxt.index.min()} -> {wxt.index.max()})  "
@@ -90,10 +128,11 @@ def main() -> None:
         f"{'Td-Tt':>8s} {'Tw-Tt':>8s}"
     )
     rows = []
-    ct_on_shs = ct3.reindex(shs.index, method="nearest", tolerance="3s")
-    for h0, h1, lbl in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    # tank T block-averaged over the 3 s around each SHS sample
+    ct_on_shs = align(shs.index, {"T_tank": ct["T_C"]},
+                      method="mean", window="3s")["T_tank"]
+    for t0, t1, _, lbl in IN_OUT:
+        h0, h1 = t0.strftime("%H:%M"), t1.strftime("%H:%M")
         s = shs.loc[t0:t1]
         c = ct_on_shs.loc[t0:t1]
         if s.empty or c.dropna().empty:
@@ -140,9 +179,7 @@ def main() -> None:
 
     diff_dry = np.full(len(shs), np.nan)
     diff_wet = np.full(len(shs), np.nan)
-    for h0, h1, _ in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    for t0, t1, _, _ in IN_OUT:
         sel = (shs.index >= t0) & (shs.index <= t1)
         diff_dry[sel] = shs["T_dry_C"].values[sel] - ct_on_shs.values[sel]
         diff_wet[sel] = shs["T_wet_C"].values[sel] - ct_on_shs.values[sel]
@@ -181,17 +218,14 @@ def main() -> None:
     color_for = {
         "IN": "tab:blue",
         "OUT": "tab:orange",
-        "start/fan-on": "k",
+        "start": "k",
         "OFF": "k",
     }
-    for h, kind in NOTES:
-        ts = note_time(h)
+    for ts, kind in zip(NOTES.times, NOTES.kinds):
         c = color_for.get(kind, "gray")
         for ax in axs:
             ax.axvline(ts, color=c, ls="--", lw=0.5, alpha=0.5)
-    for h0, h1, _ in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    for t0, t1, _, _ in IN_OUT:
         for ax in axs:
             ax.axvspan(t0, t1, color="C0", alpha=0.08, zorder=0)
 
@@ -13,7 +13,11 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
-from vapo_sat_Lab20260528 import DAY, NOTES, es, qs, note_time
+from align import align
+from decode_wxt520_sd import load_wxt
+from segment_stats import window_stats
+from shs_notes import load_notes
+from vapo_sat_Lab20260528 import es, qs
 
 
 REPO = Path(__file__).resolve().parents[1]
@@ -24,24 +28,29 @@ OUT_PNG = REPO / "img/Lab20260528/Lab20260528_WXT_vs_psychrometric_humidity.png"
 OUT_PNG.parent.mkdir(parents=True, exist_ok=True)
 
 PSY_PRESSURE_PA = 1013.25 * 100.0
+# print_summary keys -> comparison columns
+SUMMARY_COLS = {
+    "WXT_RH": "hrh",
+    "PSY_RH": "psy_RH_pct",
+    "dRH": "dRH_psy_minus_wxt_pct",
+    "WXT_e": "wxt_e_hPa",
+    "PSY_e": "psy_e_hPa",
+    "de": "de_psy_minus_wxt_hPa",
+    "WXT_q": "wxt_q_gkg",
+    "PSY_q": "psy_q_gkg",
+    "dq": "dq_psy_minus_wxt_gkg",
+}
 
-IN_OUT = [
-    ("13:11", "13:27", "IN-1"),
-    ("13:56", "14:01", "IN-2"),
-    ("14:56", "15:01", "IN-3"),
-    ("15:42", "15:49", "IN-4"),
-    ("16:30", "16:34", "IN-5"),
-    ("18:30", "18:50", "IN-6"),
-]
+NOTES = load_notes("20260528Lab")
+IN_OUT = NOTES.intervals("water")
 
 
 def main() -> None:
-    wxt = pd.read_csv(WXT_CSV, parse_dates=["time"]).set_index("time")
+    wxt = load_wxt(WXT_CSV)
     psy = pd.read_csv(PSY_CSV, parse_dates=["time"]).set_index("time")
 
     # Align the 3-second SHS psychrometric series to the 1-minute WXT records.
-    psy_on_wxt = psy.reindex(wxt.index, method="nearest", tolerance="5s")
-    comp = wxt.join(psy_on_wxt.add_prefix("psy_"))
+    comp = wxt.join(align(wxt.index, {"psy": psy}, tolerance="5s"))
 
     wxt_p_pa = comp["bpr"] * 100.0
     comp["wxt_e_hPa"] = es(comp["atmp"].to_numpy(), wxt_p_pa.to_numpy()) * (
@@ -63,8 +72,9 @@ def main() -> None:
     comp["comparison_valid"] = (
         psy_in_air
         & comp[["hrh", "atmp", "bpr", "psy_RH_pct"]].notna().all(axis=1)
-        & (comp["wndflag"] == 0)
-        & (comp["rhtpflag"] == 0)
+        & ~comp["qc_wnd_flag"]
+        & ~comp["qc_rhtp_flag"]
+        & ~comp["qc_ptu_zero"]
     )
 
     out_cols = [
@@ -88,51 +98,39 @@ def main() -> None:
     print(f"wrote {OUT_CSV}")
 
     valid = comp[comp["comparison_valid"]].copy()
-    print_summary("All in-air overlap", valid)
+    air_windows = NOTES.intervals("air")
+    # the start-up and overnight runs keep the labels of the published summary
+    air_windows[0] = air_windows[0]._replace(label="air-start")
+    air_windows[-1] = air_windows[-1]._replace(label=f"{air_windows[-1].label} overnight")
+    windows = (
+        [(None, None, "All in-air overlap")]
+        + air_windows
+        # air runs between an OUT and the next IN (not the start-up or
+        # overnight), pooled
+        + [(t0, t1, "Post-OUT active air") for t0, t1, _, _ in air_windows[1:-1]]
+    )
+    stats = window_stats(valid, windows, list(SUMMARY_COLS.values()))
 
+    print_summary("All in-air overlap", stats)
     print("\nAir intervals:")
-    air_windows = [
-        ("13:08", "13:11", "air-start"),
-        ("13:27", "13:56", "air-1"),
-        ("14:01", "14:56", "air-2"),
-        ("15:01", "15:42", "air-3"),
-        ("15:49", "16:30", "air-4"),
-        ("16:34", "18:30", "air-5"),
-        ("18:50", "2026-05-29 11:08", "air-6 overnight"),
-    ]
-    for h0, h1, label in air_windows:
-        t0 = note_time(h0)
-        t1 = note_time(h1)
-        sub = valid.loc[(valid.index >= t0) & (valid.index <= t1)]
-        print_summary(label, sub, compact=True)
-
-    active_mask = np.zeros(len(valid), dtype=bool)
-    for h0, h1, _label in air_windows[1:6]:
-        t0 = note_time(h0)
-        t1 = note_time(h1)
-        active_mask |= (valid.index >= t0) & (valid.index <= t1)
-    print_summary("Post-OUT active air", valid.loc[active_mask])
+    for iv in air_windows:
+        print_summary(iv.label, stats, compact=True)
+    print_summary("Post-OUT active air", stats)
 
     make_plot(comp, valid)
     print(f"saved {OUT_PNG}")
 
 
-def print_summary(label: str, df: pd.DataFrame, compact: bool = False) -> None:
-    if df.empty:
+def print_summary(label: str, stats: pd.DataFrame, compact: bool = False) -> None:
+    rows = stats[stats["window"] == label].set_index("variable")
+    n = int(rows["count"].max())
+    if n == 0:
         print(f"{label:<17s} N=0")
         return
-    parts = {
-        "N": len(df),
-        "WXT_RH": df["hrh"].mean(),
-        "PSY_RH": df["psy_RH_pct"].mean(),
-        "dRH": df["dRH_psy_minus_wxt_pct"].mean(),
-        "WXT_e": df["wxt_e_hPa"].mean(),
-        "PSY_e": df["psy_e_hPa"].mean(),
-        "de": df["de_psy_minus_wxt_hPa"].mean(),
-        "WXT_q": df["wxt_q_gkg"].mean(),
-        "PSY_q": df["psy_q_gkg"].mean(),
-        "dq": df["dq_psy_minus_wxt_gkg"].mean(),
-    }
+    parts = {"N": n}
+    parts.update(
+        {key: rows.loc[col, "mean"] for key, col in SUMMARY_COLS.items()}
+    )
     if not compact:
         print("\n" + label)
         print(
@@ -240,14 +238,11 @@ def make_plot(comp: pd.DataFrame, valid: pd.DataFrame) -> None:
     axs[3].grid(alpha=0.4)
     axs[3].legend(loc="upper left", fontsize=8)
 
-    for h0, h1, _label in IN_OUT:
-        t0 = pd.Timestamp(f"{DAY} {h0}")
-        t1 = pd.Timestamp(f"{DAY} {h1}")
+    for t0, t1, _, _ in IN_OUT:
         for ax in axs[:3]:
             ax.axvspan(t0, t1, color="0.8", alpha=0.35, zorder=0)
 
-    for h, kind in NOTES:
-        ts = note_time(h)
+    for ts in NOTES.times:
         for ax in axs[:3]:
             ax.axvline(ts, color="0.5", ls="--", lw=0.5, alpha=0.5)
 
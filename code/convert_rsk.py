@@ -1,6 +1,5 @@
 # convert rsk to csv
 # %%
 # convert rsk to csv
-from pyrsktools import RSK
 from matplotlib import pyplot as plt
 # %%
@@ -50,14 +50,22 @@ S-array fields (64 uchar):
     60     rhtpflag
     61     prcflag
     62-63  CRC marker (0xA5 0xA5)
+
+Follow mode (``--follow``, optionally with ``--interval SECONDS``) decodes only
+the records appended since the previous run, using a byte-offset checkpoint in
+``<outdir>/<stem>_checkpoint.json``, and appends them to the CSV / samples /
+meta outputs.
 """
 
 from __future__ import annotations
 
 import argparse
-import struct
-from datetime import datetime, timedelta
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
@@ -65,17 +73,219 @@ import pandas as pd
 
 REC_SIZE = 272
 CRC_BYTE = 0xA5
+SCAN_BLOCK = 1 << 24  # bytes per block in the CRC-marker scan
+
+# One 272-byte record, so a whole payload can be viewed as a record array.
+REC_DTYPE = np.dtype(
+    [
+        ("time", "u1", (6,)),  # sec, min, hour, <unused>, day, month
+        ("year", "<u2"),
+        ("size_str", "S6"),
+        ("size", "<u2"),
+        ("B", "<f4", (48,)),
+        ("S", "u1", (64,)),
+    ]
+)
+assert REC_DTYPE.itemsize == REC_SIZE
+
+# scalar columns taken straight from the B array, in output order
+B_SCALARS = {
+    "wspd_min": 22,
+    "wspd_max": 23,
+    "tilt_x": 35,
+    "tilt_y": 36,
+    "atmp": 37,
+    "hrh": 38,
+    "bpr": 39,
+    "precip": 40,
+    "rain_duration": 41,
+    "rain_intensity": 42,
+    "hail_accumulation": 43,
+    "hail_duration": 44,
+    "hail_intensity": 45,
+    "rain_peak_intensity": 46,
+    "hail_peak_intensity": 47,
+}
+S_FLAGS = {"wndflag": 59, "rhtpflag": 60, "prcflag": 61}
+SAMPLE_FIELDS = ("wdir11", "wspd11", "compass11")
+# The 11 samples in a record are 5 s apart, the last one at the record time
+# (the WXT is polled every 5 s and the minute is logged at :55).
+SAMPLE_PERIOD = np.timedelta64(5, "s")
+ROW_GROUP = 1440  # Parquet rows per row group: one day of 1-minute records
+
+
+class WxtSamples(NamedTuple):
+    """The 11-per-minute raw samples as contiguous (time, 11) float32 arrays,
+    row-aligned with the decoded DataFrame."""
+
+    time: np.ndarray
+    wdir11: np.ndarray
+    wspd11: np.ndarray
+    compass11: np.ndarray
+
+    def take(self, indexer) -> "WxtSamples":
+        """Rows selected by ``indexer`` (boolean mask, indices or slice)."""
+        return WxtSamples(*(np.ascontiguousarray(a[indexer]) for a in self))
+
+    def sample_times(self) -> np.ndarray:
+        """(time, 11) datetime64 timestamps of the individual samples:
+        sample k of a record was taken (10 - k) * SAMPLE_PERIOD before it."""
+        n = self.wspd11.shape[1]
+        lag = np.arange(n - 1, -1, -1) * SAMPLE_PERIOD
+        return self.time[:, None] - lag
+
+
+def _find_markers(buf: np.ndarray, lo: int = 0, hi: int | None = None) -> np.ndarray:
+    """Byte offsets of every 0xA5 0xA5 CRC marker in ``buf[lo:hi]``.
+
+    The search is vectorized and runs in fixed-size blocks (overlapping by one
+    byte) so a memory-mapped card image is never loaded whole.
+    """
+    hi = len(buf) if hi is None else min(hi, len(buf))
+    found = []
+    for a in range(lo, max(hi - 1, lo), SCAN_BLOCK):
+        block = np.asarray(buf[a:min(a + SCAN_BLOCK + 1, hi)]) == CRC_BYTE
+        found.append(np.flatnonzero(block[:-1] & block[1:]) + a)
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(found)
 
 
-def _find_first_record(buf: bytes) -> int:
-    """Scan for the 0xA5 0xA5 CRC marker, then back up REC_SIZE bytes to land
-    on the start of the record whose end was just located."""
-    for i in range(len(buf) - 1):
-        if buf[i] == CRC_BYTE and buf[i + 1] == CRC_BYTE:
-            # i+2 is just past the CRC. Step back REC_SIZE so cursor sits at
-            # the start of the NEXT record (matches the MATLAB fseek(-272)).
-            return (i + 2) - REC_SIZE
-    raise RuntimeError("No 0xA5 0xA5 CRC marker found in file")
+def _candidates(buf: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """Candidate record starts ``s`` with ``lo <= s < hi``.
+
+    A marker ending at byte ``i`` implies a record starting at
+    ``i - REC_SIZE``; candidates must also carry the 272 record-size field.
+    """
+    markers = _find_markers(buf, lo + REC_SIZE - 2, hi + REC_SIZE)
+    cand = markers + 2 - REC_SIZE
+    size = buf[cand + 14].astype(np.int64) | (buf[cand + 15].astype(np.int64) << 8)
+    return cand[size == REC_SIZE]
+
+
+def _scan_records(
+    buf: np.ndarray, lo: int = 0, hi: int | None = None
+) -> tuple[np.ndarray, list[dict], int]:
+    """Locate every record starting in ``buf[lo:hi]`` from its CRC marker.
+
+    Records are taken greedily, each one at least ``REC_SIZE`` after the
+    previous, so after a dropped or corrupt byte the decoder re-aligns on
+    the next valid record instead of losing the rest of the card.
+
+    Returns
+    -------
+    starts : byte offsets of the records to decode, ascending.
+    resync : one ``{"offset", "skipped_bytes"}`` entry per run of skipped
+        bytes between records.
+    bad_crc : number of record slots lost in those gaps (and in the tail).
+    """
+    hi = len(buf) if hi is None else min(hi, len(buf))
+    cand = _candidates(buf, lo, hi)
+
+    # Runs of candidates exactly REC_SIZE apart are taken whole; only the
+    # (few) breaks in the stride need a search for the next record.
+    breaks = np.flatnonzero(np.diff(cand) != REC_SIZE)
+    runs = []
+    i = 0
+    while i < len(cand):
+        k = np.searchsorted(breaks, i)
+        j = int(breaks[k]) if k < len(breaks) else len(cand) - 1
+        runs.append((i, j))
+        i = int(np.searchsorted(cand, cand[j] + REC_SIZE))
+    if not runs:
+        return cand, [], 0
+
+    starts = np.concatenate([cand[i:j + 1] for i, j in runs])
+    resync = []
+    bad_crc = 0
+    for (_, j), (i, _) in zip(runs[:-1], runs[1:]):
+        # a spurious candidate inside a record also breaks the stride, but
+        # the next run then starts right where it should
+        gap = int(cand[i] - (cand[j] + REC_SIZE))
+        if gap > 0:
+            resync.append({"offset": int(cand[i]), "skipped_bytes": gap})
+            bad_crc += -(-gap // REC_SIZE)
+    bad_crc += max(hi - int(starts[-1]) - REC_SIZE, 0) // REC_SIZE
+    return starts, resync, bad_crc
+
+
+def _next_record(buf: np.ndarray, offset: int) -> int | None:
+    """Start of the first record at or after byte ``offset``, or None."""
+    span = 16 * REC_SIZE
+    for lo in range(offset, len(buf), span):
+        cand = _candidates(buf, lo, lo + span)
+        if len(cand):
+            return int(cand[0])
+    return None
+
+
+def _time_key(buf: np.ndarray, start: int) -> tuple:
+    """Sortable (year, month, day, hour, minute, second) from the 8 time bytes
+    of the record at ``start``."""
+    sec, mn, hr, _unused, day, month, ylo, yhi = (int(v) for v in buf[start:start + 8])
+    return (ylo | (yhi << 8), month, day, hr, mn, sec)
+
+
+def _timestamp_key(ts: pd.Timestamp) -> tuple:
+    """``_time_key`` equivalent of a timestamp (whole seconds)."""
+    return (ts.year, ts.month, ts.day, ts.hour, ts.minute, ts.second)
+
+
+def _bisect_time(buf: np.ndarray, key: tuple, right: bool = False) -> int:
+    """Byte offset of the first record whose time is >= ``key`` (> ``key`` if
+    ``right``), found by binary search over the file reading only the time
+    bytes of a few probe records.  Assumes record times are essentially
+    monotonic, which holds for a logger writing sequentially."""
+    lo, hi = 0, len(buf)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = _next_record(buf, mid)
+        if start is None:
+            hi = mid
+            continue
+        k = _time_key(buf, start)
+        if k > key or (k == key and not right):
+            hi = mid
+        else:
+            lo = start + 1
+    return lo
+
+
+def _phase_groups(starts: np.ndarray) -> list[tuple[int, object, np.ndarray]]:
+    """Split record offsets by stride phase (``start % REC_SIZE``).
+
+    Returns ``(phase, selector, record_index)`` triples; there is a single
+    group unless a resync has shifted the alignment.
+    """
+    phase = starts % REC_SIZE
+    if len(starts) == 0 or (phase == phase[0]).all():
+        p = int(phase[0]) if len(starts) else 0
+        return [(p, slice(None), (starts - p) // REC_SIZE)]
+    groups = []
+    for p in np.unique(phase):
+        sel = phase == p
+        groups.append((int(p), sel, (starts[sel] - p) // REC_SIZE))
+    return groups
+
+
+def _gather(buf: np.ndarray, groups: list, n: int, field: str, index=None):
+    """Gather ``field`` (or ``field[:, index]``) of ``n`` records.
+
+    Records are read through one zero-copy ``REC_DTYPE`` view of ``buf`` per
+    stride phase in ``groups`` (see ``_phase_groups``), so only the requested
+    bytes are copied even after a resync has shifted the alignment.
+    """
+    out = None
+    for p, sel, k in groups:
+        nview = (len(buf) - p) // REC_SIZE
+        view = np.ndarray((nview,), dtype=REC_DTYPE, buffer=buf, offset=p)[field]
+        vals = view[k] if index is None else view[k, index]
+        if len(groups) == 1:
+            return vals
+        if out is None:
+            out = np.empty((n,) + vals.shape[1:], dtype=vals.dtype)
+        out[sel] = vals
+    return out
 
 
 def _trim_cstr(b: bytes) -> str:
@@ -83,124 +293,271 @@ def _trim_cstr(b: bytes) -> str:
     return b.split(b"\x00", 1)[0].decode("ascii", errors="replace").strip()
 
 
-def decode_wxt520(infile: str | Path) -> tuple[pd.DataFrame, dict]:
-    """Decode a WXT520-SD .DAT file.
+TIME_CAUSES = ("year", "month", "day", "hour", "minute", "second")
+
+
+def _record_times(
+    time_bytes: np.ndarray, year: np.ndarray
+) -> tuple[np.ndarray, dict]:
+    """datetime64[us] timestamps from the (N, 6) time bytes and the year
+    field, built with calendar arithmetic; NaT where the fields are invalid.
+
+    Each field is range-checked in the order ``datetime()`` would raise, and
+    the second return value counts the invalid records by the first field
+    that fails (``TIME_CAUSES``).
+    """
+    year = year.astype(np.int64)
+    month = time_bytes[:, 5].astype(np.int64)
+    day = time_bytes[:, 4].astype(np.int64)
+    hour = time_bytes[:, 2].astype(np.int64)
+    minute = time_bytes[:, 1].astype(np.int64)
+    second = time_bytes[:, 0].astype(np.int64)
+
+    year_ok = (year >= 1) & (year <= 9999)
+    month_ok = (month >= 1) & (month <= 12)
+    # first day of the month (clipped so invalid rows stay representable)
+    months = (np.where(year_ok, year, 1970) - 1970) * 12 + np.clip(month, 1, 12) - 1
+    first = months.astype("datetime64[M]").astype("datetime64[D]")
+    ndays = ((months + 1).astype("datetime64[M]").astype("datetime64[D]")
+             - first).astype(np.int64)
+    checks = {
+        "year": year_ok,
+        "month": month_ok,
+        "day": (day >= 1) & (day <= ndays),
+        "hour": hour < 24,
+        "minute": minute < 60,
+        "second": second < 60,
+    }
+
+    ok = np.ones(len(year), dtype=bool)
+    causes = {}
+    for cause in TIME_CAUSES:
+        bad = ok & ~checks[cause]
+        causes[cause] = int(bad.sum())
+        ok &= checks[cause]
+
+    seconds = (day - 1) * 86400 + hour * 3600 + minute * 60 + second
+    times = (first.astype("datetime64[us]")
+             + (seconds * 1_000_000).astype("timedelta64[us]"))
+    times[~ok] = np.datetime64("NaT")
+    return times, causes
+
+
+def wind_vector_average(
+    wdir11: np.ndarray, wspd11: np.ndarray, compass11: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Compass-corrected vector-average wind for a batch of records.
+
+    Inputs are (N, k) arrays of raw direction, speed and compass samples
+    (k = 11 for one WXT record per row, but any grouping works, e.g. an hour
+    of records reshaped to (N/60, 660)).  Speeds >= 999 are masked out of the
+    wind average; the compass is a unit-vector mean over all samples.  Work is
+    done in float64 regardless of the input dtype, so results equal the
+    original per-record calculation.
+
+    Returns a dict of (N,) arrays: ``wnde``, ``wndn``, ``wspd``, ``wdir``
+    (meteorological convention) and ``compass``; rows with no valid speed
+    are NaN.
+    """
+    wdir11 = np.asarray(wdir11, dtype=float)
+    wspd11 = np.asarray(wspd11, dtype=float)
+    compass11 = np.asarray(compass11, dtype=float)
+
+    # vector-average wind (meteorological convention, with compass rotation)
+    theta = np.deg2rad(np.mod(wdir11 + compass11, 360.0))
+    spd_ok = wspd11 < 999.0
+    n_ok = np.count_nonzero(spd_ok, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        wnde = np.sum(wspd11 * np.sin(theta), axis=1, where=spd_ok) / n_ok
+        wndn = np.sum(wspd11 * np.cos(theta), axis=1, where=spd_ok) / n_ok
+    wspd = np.hypot(wnde, wndn)
+    wdir = np.mod(np.rad2deg(np.arctan2(wnde, wndn)), 360.0)
+
+    # compass scalar average (unit-vector mean)
+    cmp_rad = np.deg2rad(compass11)
+    cu = np.mean(np.sin(cmp_rad), axis=1)
+    cv = np.mean(np.cos(cmp_rad), axis=1)
+    compass = np.mod(np.rad2deg(np.arctan2(cu, cv)), 360.0)
+    return {"wnde": wnde, "wndn": wndn, "wspd": wspd,
+            "wdir": wdir, "compass": compass}
+
+
+def wind_sample_series(samples: WxtSamples) -> pd.DataFrame:
+    """The raw wind samples as one time series (11 rows per record).
+
+    Each sample gets its own timestamp (``WxtSamples.sample_times``) and the
+    compass-rotated east / north components, in the same convention as
+    ``wind_vector_average`` (so their mean over a record's valid samples is
+    that record's ``wnde`` / ``wndn``).  Speeds >= 999 give NaN components.
+
+    Returns
+    -------
+    DataFrame indexed by sample time with ``wdir``, ``wspd``, ``compass``,
+    ``wnde`` and ``wndn``.
+    """
+    wdir = samples.wdir11.ravel().astype(float)
+    wspd = samples.wspd11.ravel().astype(float)
+    compass = samples.compass11.ravel().astype(float)
+    theta = np.deg2rad(np.mod(wdir + compass, 360.0))
+    ok = wspd < 999.0
+    return pd.DataFrame(
+        {
+            "wdir": wdir,
+            "wspd": wspd,
+            "compass": compass,
+            "wnde": np.where(ok, wspd * np.sin(theta), np.nan),
+            "wndn": np.where(ok, wspd * np.cos(theta), np.nan),
+        },
+        index=pd.DatetimeIndex(samples.sample_times().ravel(), name="time"),
+    )
+
+
+def wxt_qc(cols, samples: WxtSamples | None = None) -> dict[str, np.ndarray]:
+    """Boolean / count QC columns for decoded WXT records.
+
+    ``cols`` is anything indexable by column name (the decoder's column dict
+    or a loaded DataFrame) holding the status flags and PTU channels.
+
+    Returns a dict of (N,) arrays:
+    ``qc_wnd_flag`` / ``qc_rhtp_flag`` / ``qc_prc_flag`` (status flag
+    nonzero), ``qc_ptu_zero`` (atmp, hrh and bpr all exactly 0, i.e. the PTU
+    module is not reporting), and with ``samples`` ``qc_wind_nbad`` (how many
+    of the 11 speeds are the >= 999 sentinel) and ``qc_wind_bad`` (all 11
+    are, so the averaged wind is NaN).
+    """
+    qc = {
+        "qc_wnd_flag": np.asarray(cols["wndflag"]) != 0,
+        "qc_rhtp_flag": np.asarray(cols["rhtpflag"]) != 0,
+        "qc_prc_flag": np.asarray(cols["prcflag"]) != 0,
+        "qc_ptu_zero": ((np.asarray(cols["atmp"]) == 0)
+                        & (np.asarray(cols["hrh"]) == 0)
+                        & (np.asarray(cols["bpr"]) == 0)),
+    }
+    if samples is not None:
+        nbad = np.count_nonzero(samples.wspd11 >= 999.0, axis=1)
+        qc["qc_wind_nbad"] = nbad.astype(np.uint8)
+        qc["qc_wind_bad"] = nbad == samples.wspd11.shape[1]
+    return qc
+
+
+def _sort_unique(times: np.ndarray) -> tuple[np.ndarray | None, dict]:
+    """Positions that put ``times`` in order with duplicates dropped.
+
+    Sorts, then drops duplicate times and any record whose timestamp goes
+    backwards onto an earlier one (matches MATLAB flag logic); the first
+    occurrence wins.  The positions are None when ``times`` is already
+    strictly increasing.  The counts report records that were out of order
+    (earlier than a preceding record) and records dropped as duplicates.
+    """
+    step = np.diff(times)
+    if (step > np.timedelta64(0, "s")).all():
+        return None, {"out_of_order": 0, "duplicate": 0}
+    out_of_order = int((times[1:] < np.maximum.accumulate(times)[:-1]).sum())
+    order = np.argsort(times, kind="stable")
+    keep = np.r_[True, np.diff(times[order]) > np.timedelta64(0, "s")]
+    counts = {"out_of_order": out_of_order,
+              "duplicate": int(len(times) - keep.sum())}
+    return order[keep], counts
+
+
+def decode_wxt520(
+    infile: str | Path | list[str | Path],
+    tstart=None,
+    tend=None,
+    offset: int = 0,
+    workers: int | None = None,
+) -> tuple[pd.DataFrame, WxtSamples, dict]:
+    """Decode a WXT520-SD .DAT file (or a list of them, see
+    ``decode_wxt520_many``; ``workers`` only applies there).
+
+    The file is memory-mapped and viewed in place as a ``REC_DTYPE`` record
+    array, so nothing is copied up front.  Records are located from their CRC
+    markers (``_scan_records``), so corrupt or dropped bytes cost only the
+    damaged records; each output column is gathered
+    straight from the mapping with array operations.  Peak memory therefore
+    scales with the decoded columns rather than the size of the card image.
+
+    ``tstart`` / ``tend`` (inclusive, anything ``pd.Timestamp`` accepts) are
+    pushed down into the read: the byte range holding the window is found by
+    binary search on the record time bytes, and only records inside it are
+    scanned and decoded.  ``offset`` skips everything before that byte (used
+    by ``follow_wxt520`` to decode only newly appended records) and is only
+    accepted for a single file; ``meta["end_offset"]`` is the byte just past
+    the last complete record.
 
     Returns
     -------
     df : pandas.DataFrame indexed by UTC time, with one row per 1-minute record.
+    samples : WxtSamples with the raw (time, 11) wdir / wspd / compass arrays.
     meta : dict with firmware / serial / file-level metadata.
     """
+    if not isinstance(infile, (str, Path)):
+        if offset:
+            raise ValueError("offset applies to a single file, not a list")
+        return decode_wxt520_many(infile, tstart, tend, workers)
     infile = Path(infile)
-    buf = infile.read_bytes()
-    start = _find_first_record(buf)
-    if start < 0:
-        # very short file: first CRC is inside the first record, start at 0
-        start = 0
-
-    payload = buf[start:]
-    nrecs = len(payload) // REC_SIZE
-    if nrecs == 0:
-        raise RuntimeError(f"File {infile} too small ({len(buf)} bytes)")
-
-    print(f"Reading {infile.name}: {len(buf)} bytes, starting at offset "
-          f"{start}, expecting up to {nrecs} records")
-
-    records = []
-    meta_fw = {"version": [], "brdversion": [], "modser": [], "sensor": []}
-    bad_crc = 0
-    bad_time = 0
+    size = infile.stat().st_size
+    if size < REC_SIZE:
+        raise RuntimeError(f"File {infile} too small ({size} bytes)")
+    buf = np.memmap(infile, dtype=np.uint8, mode="r")
+    tstart = None if tstart is None else pd.Timestamp(tstart)
+    tend = None if tend is None else pd.Timestamp(tend)
+    lo = offset if tstart is None else max(
+        offset, _bisect_time(buf, _timestamp_key(tstart)))
+    hi = size if tend is None else _bisect_time(buf, _timestamp_key(tend),
+                                                right=True)
+    starts, resync, bad_crc = _scan_records(buf, lo, hi)
+    if len(starts) == 0:
+        if tstart is None and tend is None:
+            raise RuntimeError("No 0xA5 0xA5 CRC marker found in file")
+        raise RuntimeError(f"No records in {infile} between {tstart} and {tend}")
 
-    for i in range(nrecs):
-        rec = payload[i * REC_SIZE:(i + 1) * REC_SIZE]
-        if len(rec) < REC_SIZE:
-            break
+    print(f"Reading {infile.name}: {size} bytes, first record at offset "
+          f"{starts[0]}, {len(starts)} records, {len(resync)} resync point(s)")
 
-        # CRC check
-        if rec[270] != CRC_BYTE or rec[271] != CRC_BYTE:
-            bad_crc += 1
-            continue
+    groups = _phase_groups(starts)
+    times, bad_causes = _record_times(_gather(buf, groups, len(starts), "time"),
+                                      _gather(buf, groups, len(starts), "year"))
+    time_ok = ~np.isnat(times)
+    bad_time = int((~time_ok).sum())
+    # exact window edges (the byte range is only as precise as a record)
+    if tstart is not None:
+        time_ok &= times >= tstart.to_datetime64()
+    if tend is not None:
+        time_ok &= times <= tend.to_datetime64()
+    idx = starts[time_ok]
+    times = times[time_ok]
 
-        sec, mn, hr, _unused, day, month = struct.unpack_from("<6B", rec, 0)
-        (year,) = struct.unpack_from("<H", rec, 6)
-        try:
-            ts = datetime(year, month, day, hr, mn, sec)
-        except ValueError:
-            bad_time += 1
-            continue
+    if len(idx) == 0:
+        raise RuntimeError("No valid records decoded")
 
-        B = np.frombuffer(rec, dtype="<f4", count=48, offset=16)
-        S = np.frombuffer(rec, dtype=np.uint8, count=64, offset=208)
-
-        rowd = {
-            "time": ts,
-            "wspd_min": float(B[22]),
-            "wspd_max": float(B[23]),
-            "tilt_x": float(B[35]),
-            "tilt_y": float(B[36]),
-            "atmp": float(B[37]),
-            "hrh": float(B[38]),
-            "bpr": float(B[39]),
-            "precip": float(B[40]),
-            "rain_duration": float(B[41]),
-            "rain_intensity": float(B[42]),
-            "hail_accumulation": float(B[43]),
-            "hail_duration": float(B[44]),
-            "hail_intensity": float(B[45]),
-            "rain_peak_intensity": float(B[46]),
-            "hail_peak_intensity": float(B[47]),
-            "wndflag": int(S[59]),
-            "rhtpflag": int(S[60]),
-            "prcflag": int(S[61]),
-        }
-        wdir11 = B[0:11].astype(float)
-        wspd11 = B[11:22].astype(float)
-        compass11 = B[24:35].astype(float)
-
-        # raw arrays as JSON-friendly lists (for traceability)
-        rowd["wdir11"] = wdir11.tolist()
-        rowd["wspd11"] = wspd11.tolist()
-        rowd["compass11"] = compass11.tolist()
-
-        # vector-average wind (meteorological convention, with compass rotation)
-        tdir = np.mod(wdir11 + compass11, 360.0)
-        spd_ok = wspd11 < 999.0
-        if spd_ok.any():
-            theta = np.deg2rad(tdir[spd_ok])
-            spd = wspd11[spd_ok]
-            wnde11 = spd * np.sin(theta)
-            wndn11 = spd * np.cos(theta)
-            wnde = float(np.mean(wnde11))
-            wndn = float(np.mean(wndn11))
-            wspd = float(np.hypot(wnde, wndn))
-            wdir = float(np.mod(np.rad2deg(np.arctan2(wnde, wndn)), 360.0))
-        else:
-            wnde = wndn = wspd = wdir = np.nan
+    order, order_counts = _sort_unique(times)
+    bad_causes.update(order_counts)
+    if order is not None:
+        idx = idx[order]
+        times = times[order]
 
-        # compass scalar average (unit-vector mean)
-        cmp_rad = np.deg2rad(compass11)
-        cu = float(np.mean(np.sin(cmp_rad)))
-        cv = float(np.mean(np.cos(cmp_rad)))
-        compass = float(np.mod(np.rad2deg(np.arctan2(cu, cv)), 360.0))
+    groups = _phase_groups(idx)
 
-        rowd.update({"wnde": wnde, "wndn": wndn, "wspd": wspd,
-                     "wdir": wdir, "compass": compass})
-        records.append(rowd)
+    def b_block(index):
+        return _gather(buf, groups, len(idx), "B", index)
 
-        meta_fw["version"].append(_trim_cstr(bytes(S[0:20])))
-        meta_fw["brdversion"].append(_trim_cstr(bytes(S[20:36])))
-        meta_fw["modser"].append(_trim_cstr(bytes(S[36:40])))
-        meta_fw["sensor"].append(_trim_cstr(bytes(S[40:48])))
+    def s_block(index):
+        return _gather(buf, groups, len(idx), "S", index)
 
-    if not records:
-        raise RuntimeError("No valid records decoded")
+    cols = {name: b_block(i).astype(float) for name, i in B_SCALARS.items()}
+    cols.update({name: s_block(i).astype(np.int64) for name, i in S_FLAGS.items()})
+    samples = WxtSamples(
+        times,
+        b_block(slice(0, 11)),
+        b_block(slice(11, 22)),
+        b_block(slice(24, 35)),
+    )
+    cols.update(wind_vector_average(samples.wdir11, samples.wspd11,
+                                    samples.compass11))
+    cols.update(wxt_qc(cols, samples))
 
-    df = pd.DataFrame.from_records(records)
-    df = df.sort_values("time").drop_duplicates(subset="time")
-    # drop records whose timestamp goes backwards (matches MATLAB flag logic)
-    keep = np.r_[True, np.diff(df["time"].values).astype("timedelta64[s]")
-                 .astype(int) > 0]
-    df = df.loc[keep].set_index("time")
+    df = pd.DataFrame(cols, index=pd.DatetimeIndex(times, name="time"))
 
     meta = {
         "infile": str(infile),
@@ -209,99 +566,600 @@ def decode_wxt520(infile: str | Path) -> tuple[pd.DataFrame, dict]:
             "model": "WXT520",
             "model_vers": "SD",
         },
-        "firmware_version": _mode(meta_fw["version"]),
-        "board_version": _mode(meta_fw["brdversion"]),
-        "module_sn": _mode(meta_fw["modser"]),
-        "sensor_sn": _mode(meta_fw["sensor"]),
+        "firmware_version": _mode_cstr(s_block(slice(0, 20))),
+        "board_version": _mode_cstr(s_block(slice(20, 36))),
+        "module_sn": _mode_cstr(s_block(slice(36, 40))),
+        "sensor_sn": _mode_cstr(s_block(slice(40, 48))),
+        # every module / sensor serial seen, with the time range it covers
+        "serial_ranges": {
+            "module_sn": _cstr_runs(s_block(slice(36, 40)), times),
+            "sensor_sn": _cstr_runs(s_block(slice(40, 48)), times),
+        },
         "nrecs_decoded": int(len(df)),
         "bad_crc": int(bad_crc),
         "bad_time": int(bad_time),
+        # invalid time fields by first failing field, plus sort/dedupe counts
+        "bad_time_causes": bad_causes,
+        "resync": resync,
+        "end_offset": int(starts[-1]) + REC_SIZE,
+        "time_start": df.index.min().isoformat(),
+        "time_end": df.index.max().isoformat(),
+    }
+    return df, samples, meta
+
+
+def _decode_timed(infile: Path, tstart, tend):
+    """Process-pool worker: decode one file and time it."""
+    t0 = time.perf_counter()
+    try:
+        df, samples, meta = decode_wxt520(infile, tstart, tend)
+    except RuntimeError as err:
+        return None, None, {"infile": str(infile), "error": str(err)}, 0.0
+    return df, samples, meta, time.perf_counter() - t0
+
+
+def decode_wxt520_many(
+    infiles: list[str | Path],
+    tstart=None,
+    tend=None,
+    workers: int | None = None,
+) -> tuple[pd.DataFrame, WxtSamples, dict]:
+    """Decode several .DAT files on a process pool and merge them.
+
+    Each file is decoded independently (``decode_wxt520``); the records are
+    then concatenated and put through the same sort / de-duplicate /
+    backwards-time filter as a single file, so overlapping cards (e.g. a card
+    image copied before and after a test) give one clean time series.  Files
+    with no records (in the window) are reported and skipped.
+
+    ``meta`` carries the summed counts, the distinct firmware / serial strings
+    and a ``files`` list with each file's own meta plus its decode time and
+    throughput (``seconds``, ``MB_per_s``).
+    """
+    infiles = [Path(f) for f in infiles]
+    workers = workers or min(len(infiles), os.cpu_count() or 1)
+    if workers > 1 and len(infiles) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_decode_timed, infiles,
+                                    [tstart] * len(infiles),
+                                    [tend] * len(infiles)))
+    else:
+        results = [_decode_timed(f, tstart, tend) for f in infiles]
+
+    files = []
+    parts = []
+    for infile, (df, samples, meta, seconds) in zip(infiles, results):
+        nbytes = infile.stat().st_size
+        meta = {**meta, "bytes": nbytes, "seconds": round(seconds, 4),
+                "MB_per_s": round(nbytes / 1e6 / seconds, 1) if seconds else None}
+        files.append(meta)
+        if df is None:
+            print(f"  skipping {infile.name}: {meta['error']}")
+            continue
+        parts.append((df, samples))
+    if not parts:
+        raise RuntimeError("No valid records decoded from any file")
+
+    times = np.concatenate([s.time for _, s in parts])
+    samples = WxtSamples(*(np.concatenate(a) for a in zip(*(s for _, s in parts))))
+    df = pd.concat([d for d, _ in parts])
+    order, order_counts = _sort_unique(times)
+    if order is not None:
+        df = df.iloc[order]
+        samples = samples.take(order)
+
+    decoded = [m for m in files if "error" not in m]
+
+    def distinct(key):
+        return ", ".join(dict.fromkeys(m[key] for m in decoded))
+
+    meta = {
+        "infile": ", ".join(m["infile"] for m in decoded),
+        "instrument": decoded[0]["instrument"],
+        "firmware_version": distinct("firmware_version"),
+        "board_version": distinct("board_version"),
+        "module_sn": distinct("module_sn"),
+        "sensor_sn": distinct("sensor_sn"),
+        "serial_ranges": {
+            key: sorted((r for m in decoded for r in m["serial_ranges"][key]),
+                        key=lambda r: r["time_start"])
+            for key in ("module_sn", "sensor_sn")
+        },
+        "nrecs_decoded": int(len(df)),
+        "duplicates": order_counts["duplicate"],
+        "bad_crc": sum(m["bad_crc"] for m in decoded),
+        "bad_time": sum(m["bad_time"] for m in decoded),
+        "bad_time_causes": {
+            k: sum(m["bad_time_causes"][k] for m in decoded)
+            for k in decoded[0]["bad_time_causes"]
+        },
+        "resync": [{"infile": m["infile"], **r}
+                   for m in decoded for r in m["resync"]],
         "time_start": df.index.min().isoformat(),
         "time_end": df.index.max().isoformat(),
+        "files": files,
     }
-    return df, meta
+    return df, samples, meta
 
 
-def _mode(values: list[str]) -> str:
-    if not values:
+def _mode_cstr(field: np.ndarray) -> str:
+    """Most common trimmed C string in an (N, width) uint8 array.
+
+    Only the distinct raw byte strings are trimmed, so the cost does not grow
+    with the number of records.
+    """
+    if len(field) == 0:
         return ""
-    s = pd.Series(values)
-    s = s[s != ""]
-    if s.empty:
+    width = field.shape[1]
+    raw, counts = np.unique(
+        np.ascontiguousarray(field).view(f"S{width}").ravel(), return_counts=True
+    )
+    totals: dict[str, int] = {}
+    for value, count in zip(raw, counts):
+        key = _trim_cstr(bytes(value))
+        if key:
+            totals[key] = totals.get(key, 0) + int(count)
+    if not totals:
         return ""
-    return str(s.mode().iloc[0])
+    # highest count wins; ties go to the smallest string, like Series.mode()
+    return min(totals, key=lambda k: (-totals[k], k))
 
 
-def main(argv: list[str] | None = None) -> int:
-    p = argparse.ArgumentParser(description=__doc__)
-    p.add_argument("infile", type=Path,
-                   help="path to ASWXT*.DAT file")
-    p.add_argument("--outdir", type=Path, default=None,
-                   help="output directory (defaults to <infile_stem>_processed/)")
-    p.add_argument("--tstart", type=str, default=None,
-                   help="ISO start time to keep (UTC), inclusive")
-    p.add_argument("--tend", type=str, default=None,
-                   help="ISO end time to keep (UTC), inclusive")
-    args = p.parse_args(argv)
+def _cstr_runs(field: np.ndarray, times: np.ndarray) -> list[dict]:
+    """Time ranges over which a fixed-width C string field is constant.
 
-    df, meta = decode_wxt520(args.infile)
+    Change points are found by comparing neighbouring rows of the
+    byte-string view, so only the (usually one) runs are trimmed in Python.
+    Blank values are ignored and runs with the same trimmed value merge.
+    """
+    if len(field) == 0:
+        return []
+    width = field.shape[1]
+    raw = np.ascontiguousarray(field).view(f"S{width}").ravel()
+    starts = np.r_[0, np.flatnonzero(raw[1:] != raw[:-1]) + 1]
+    ends = np.r_[starts[1:], len(raw)] - 1
+    runs: list[dict] = []
+    for a, b in zip(starts, ends):
+        value = _trim_cstr(bytes(raw[a]))
+        if not value:
+            continue
+        if runs and runs[-1]["value"] == value:
+            runs[-1]["time_end"] = pd.Timestamp(times[b]).isoformat()
+            continue
+        runs.append({"value": value,
+                     "time_start": pd.Timestamp(times[a]).isoformat(),
+                     "time_end": pd.Timestamp(times[b]).isoformat()})
+    return runs
 
-    if args.tstart:
-        df = df.loc[df.index >= pd.Timestamp(args.tstart)]
-    if args.tend:
-        df = df.loc[df.index <= pd.Timestamp(args.tend)]
-    meta["nrecs_decoded"] = int(len(df))
-    meta["time_start"] = df.index.min().isoformat()
-    meta["time_end"] = df.index.max().isoformat()
 
-    outdir = args.outdir or (args.infile.parent
-                             / f"{args.infile.stem}_processed")
+def write_outputs(
+    df: pd.DataFrame, samples: WxtSamples, meta: dict, outdir: Path, stem: str
+) -> list[Path]:
+    """Write CSV, (time, 11) sample arrays, NetCDF and meta JSON to ``outdir``."""
     outdir.mkdir(parents=True, exist_ok=True)
+    written = []
 
-    # narrow CSV (drop the per-record 11-sample arrays which are awkward in CSV)
-    scalar_cols = [c for c in df.columns
-                   if c not in ("wdir11", "wspd11", "compass11")]
-    csv_path = outdir / f"{args.infile.stem}.csv"
-    df[scalar_cols].to_csv(csv_path)
+    csv_path = outdir / f"{stem}.csv"
+    df.to_csv(csv_path)
+    written.append(csv_path)
 
-    # full pickle preserves the 11-sample arrays as Python lists
-    pkl_path = outdir / f"{args.infile.stem}.pkl"
-    df.to_pickle(pkl_path)
+    # the (time, 11) sample arrays, loadable with np.load (or load_samples,
+    # once append_outputs has added part files)
+    for part in _sample_parts(outdir / stem):
+        part.unlink()
+    npz_path = outdir / f"{stem}_samples.npz"
+    np.savez(npz_path, **samples._asdict())
+    written.append(npz_path)
 
     # try to also write a NetCDF (xarray is optional)
     try:
         import xarray as xr
-        ds = xr.Dataset.from_dataframe(df[scalar_cols])
+        ds = xr.Dataset.from_dataframe(df)
         # add the (time, 11) arrays as 2-D variables
-        for col in ("wdir11", "wspd11", "compass11"):
-            arr = np.vstack(df[col].to_numpy())
-            ds[col] = (("time", "sample"), arr)
+        for col in SAMPLE_FIELDS:
+            ds[col] = (("time", "sample"), getattr(samples, col))
         for k, v in meta["instrument"].items():
             ds.attrs[f"instrument_{k}"] = v
         for k in ("firmware_version", "board_version", "module_sn",
                   "sensor_sn", "infile", "nrecs_decoded",
                   "bad_crc", "bad_time"):
             ds.attrs[k] = meta[k]
-        nc_path = outdir / f"{args.infile.stem}.nc"
+        nc_path = outdir / f"{stem}.nc"
         ds.to_netcdf(nc_path)
-        print(f"  wrote {nc_path}")
+        written.append(nc_path)
     except ImportError:
         print("  (xarray not available, skipping NetCDF output)")
 
-    import json
-    meta_path = outdir / f"{args.infile.stem}_meta.json"
+    # columnar copy for fast reloads (pyarrow is optional)
+    try:
+        pq_path = outdir / f"{stem}.parquet"
+        write_parquet(df, samples, meta, pq_path)
+        written.append(pq_path)
+    except ImportError:
+        print("  (pyarrow not available, skipping Parquet output)")
+
+    meta_path = outdir / f"{stem}_meta.json"
     meta_path.write_text(json.dumps(meta, indent=2))
+    written.append(meta_path)
+    return written
+
+
+def append_outputs(
+    df: pd.DataFrame, samples: WxtSamples, meta: dict, outdir: Path, stem: str
+) -> list[Path]:
+    """Append newly decoded records to the outputs of ``write_outputs``.
+
+    The CSV is appended in place, the sample arrays go to the next numbered
+    ``<stem>_samples.NNNNN.npz`` part file (``load_samples`` joins them)
+    and to a new part of the Parquet dataset, and the meta JSON is
+    extended; the NetCDF is left for a full (non-follow) run to rebuild.  Nothing already written is read
+    back, so a refresh costs time proportional to the new records.
+    """
+    csv_path = outdir / f"{stem}.csv"
+    df.to_csv(csv_path, mode="a", header=not csv_path.exists())
+
+    parts = _sample_parts(outdir / stem)
+    n = int(parts[-1].suffixes[-2][1:]) + 1 if parts else 1
+    npz_path = outdir / f"{stem}_samples.{n:05d}.npz"
+    np.savez(npz_path, **samples._asdict())
+
+    pq_path = outdir / f"{stem}.parquet"
+    try:
+        write_parquet(df, samples, meta, pq_path, append=pq_path.exists())
+    except ImportError:
+        pass
+
+    meta_path = outdir / f"{stem}_meta.json"
+    if meta_path.exists():
+        total = json.loads(meta_path.read_text())
+        for k in ("nrecs_decoded", "bad_crc", "bad_time"):
+            total[k] = total.get(k, 0) + meta[k]
+        causes = total.setdefault("bad_time_causes", {})
+        for k, n in meta["bad_time_causes"].items():
+            causes[k] = causes.get(k, 0) + n
+        total["resync"] = total.get("resync", []) + meta["resync"]
+        ranges = total.setdefault("serial_ranges", {})
+        for key, runs in meta["serial_ranges"].items():
+            old_runs = ranges.setdefault(key, [])
+            for r in runs:
+                if old_runs and old_runs[-1]["value"] == r["value"]:
+                    old_runs[-1]["time_end"] = r["time_end"]
+                else:
+                    old_runs.append(r)
+        total["time_end"] = meta["time_end"]
+        total["end_offset"] = meta["end_offset"]
+        meta = total
+    meta_path.write_text(json.dumps(meta, indent=2))
+    return [csv_path, npz_path, pq_path, meta_path]
+
+
+def _sample_parts(stem: Path) -> list[Path]:
+    """The ``<stem>_samples.NNNNN.npz`` part files added by
+    ``append_outputs``, in write order."""
+    return sorted(stem.parent.glob(f"{stem.name}_samples.*.npz"))
+
+
+def load_samples(stem: str | Path) -> WxtSamples:
+    """Load the (time, 11) sample arrays written for ``stem`` (output
+    directory / file stem), joining any part files from follow mode."""
+    stem = Path(stem)
+    first = Path(f"{stem}_samples.npz")
+    parts = ([first] if first.exists() else []) + _sample_parts(stem)
+    if not parts:
+        raise FileNotFoundError(f"No sample arrays for {stem}")
+    chunks = []
+    for part in parts:
+        with np.load(part) as z:
+            chunks.append([z[k] for k in WxtSamples._fields])
+    return WxtSamples(*(np.concatenate(cols) for cols in zip(*chunks)))
+
+
+def _arrow_table(df: pd.DataFrame, samples: WxtSamples, meta: dict):
+    import pyarrow as pa
+
+    arrays = [pa.array(df.index.to_numpy())]
+    names = ["time"]
+    for col in df.columns:
+        values = df[col].to_numpy()
+        # the payload is float32 / uint8 on the card; store it that way
+        if col in B_SCALARS:
+            values = values.astype(np.float32)
+        elif col in S_FLAGS:
+            values = values.astype(np.uint8)
+        arrays.append(pa.array(values))
+        names.append(col)
+    for col in SAMPLE_FIELDS:
+        values = np.ascontiguousarray(getattr(samples, col), dtype=np.float32)
+        arrays.append(pa.FixedSizeListArray.from_arrays(
+            pa.array(values.ravel()), values.shape[1]))
+        names.append(col)
+    table = pa.Table.from_arrays(arrays, names=names)
+    return table.replace_schema_metadata({"wxt520_meta": json.dumps(meta)})
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    samples: WxtSamples,
+    meta: dict,
+    path: Path,
+    append: bool = False,
+) -> None:
+    """Write the decoded records to a Parquet dataset, one row group per day.
+
+    ``path`` is a directory of ``part-NNNNN.parquet`` files that read back
+    as one table (``pq.read_table(path)``).  Without ``append`` it is
+    cleared and the records become ``part-00000``; with ``append=True``
+    they go to the next part, so a follow-mode refresh writes only the new
+    records.  Scalar channels keep their on-card types (float32 payload,
+    uint8 flags) and the 11-sample wind arrays are fixed-size lists, so
+    ``load_wxt`` can rebuild ``WxtSamples`` without parsing.  Rows must
+    already be time sorted (``decode_wxt520`` guarantees this), which keeps
+    the per-row-group min/max statistics disjoint for time-range pushdown.
+    """
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    table = _arrow_table(df, samples, meta)
+    if path.is_file():
+        # single-file output from before the dataset layout
+        if append:
+            old = path.with_name(path.name + ".old")
+            path.replace(old)
+            path.mkdir()
+            old.replace(path / "part-00000.parquet")
+        else:
+            path.unlink()
+    parts = _parquet_parts(path)
+    if not append:
+        for part in parts:
+            part.unlink()
+        parts = []
+    path.mkdir(parents=True, exist_ok=True)
+    n = int(parts[-1].stem[len("part-"):]) + 1 if parts else 0
+    pq.write_table(table, path / f"part-{n:05d}.parquet",
+                   row_group_size=ROW_GROUP)
+
+
+def _parquet_parts(path: Path) -> list[Path]:
+    """Part files of the Parquet dataset at ``path``, in write order."""
+    return sorted(path.glob("part-*.parquet")) if path.is_dir() else []
+
+
+def load_wxt(
+    path: str | Path,
+    tstart=None,
+    tend=None,
+    columns: list[str] | None = None,
+    samples: bool = False,
+):
+    """Load decoded WXT records, preferring ``<stem>.parquet`` over the CSV.
+
+    ``path`` may name either output (or the stem).  The Parquet dataset is
+    used when pyarrow is available and its newest part is at least as new
+    as the CSV; the
+    ``tstart``/``tend`` window (inclusive) is pushed down to the reader so
+    only the overlapping row groups are read, and ``columns`` limits which
+    channels are decoded.  Otherwise the CSV is parsed and sliced.  Either
+    way the channels come back as ``decode_wxt520`` gives them (float64
+    payload, int64 flags).
+
+    Returns
+    -------
+    df : DataFrame indexed by time
+    samples : WxtSamples, only when ``samples=True``
+    """
+    path = Path(path)
+    stem = path.with_suffix("")
+    pq_path = stem.with_suffix(".parquet")
+    csv_path = stem.with_suffix(".csv")
+    tstart = None if tstart is None else pd.Timestamp(tstart)
+    tend = None if tend is None else pd.Timestamp(tend)
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        pq = None
+    parts = _parquet_parts(pq_path) or ([pq_path] if pq_path.is_file() else [])
+    fresh = bool(parts) and (
+        not csv_path.exists()
+        or max(p.stat().st_mtime for p in parts) >= csv_path.stat().st_mtime)
+    if pq is not None and fresh:
+        filters = []
+        if tstart is not None:
+            filters.append(("time", ">=", tstart))
+        if tend is not None:
+            filters.append(("time", "<=", tend))
+        read_cols = None
+        if columns is not None:
+            read_cols = ["time", *columns]
+            if samples:
+                read_cols += [c for c in SAMPLE_FIELDS if c not in read_cols]
+        table = pq.read_table(pq_path, columns=read_cols,
+                              filters=filters or None)
+        lists = {c: table.column(c) for c in SAMPLE_FIELDS
+                 if c in table.column_names}
+        table = table.drop_columns(list(lists))
+        df = table.to_pandas().set_index("time")
+        df = df.astype({c: np.float64 if c in B_SCALARS else np.int64
+                        for c in df.columns if c in B_SCALARS or c in S_FLAGS})
+        if not samples:
+            return df
+        times = df.index.to_numpy()
+        return df, WxtSamples(times, *(
+            np.asarray(lists[c].combine_chunks().flatten(),
+                       dtype=np.float32).reshape(-1, 11)
+            for c in SAMPLE_FIELDS))
+
+    df = pd.read_csv(csv_path, parse_dates=["time"],
+                     dtype={"qc_wind_nbad": np.uint8}).set_index("time")
+    if "qc_ptu_zero" not in df:
+        # written before the QC columns existed
+        df = df.assign(**wxt_qc(df))
+    keep = np.ones(len(df), dtype=bool)
+    if tstart is not None:
+        keep &= df.index >= tstart
+    if tend is not None:
+        keep &= df.index <= tend
+    full = df
+    df = df.loc[keep]
+    if columns is not None:
+        df = df[columns]
+    if not samples:
+        return df
+    z = load_samples(stem)
+    smp = WxtSamples(full.index.to_numpy(),
+                     *(getattr(z, c) for c in SAMPLE_FIELDS)).take(keep)
+    return df, smp
+
+
+def follow_wxt520(
+    infile: str | Path, outdir: Path
+) -> tuple[pd.DataFrame, WxtSamples, dict] | None:
+    """Decode only the records appended to ``infile`` since the last call.
+
+    Progress (byte offset past the last complete record, and the last
+    timestamp written) is kept in ``<outdir>/<stem>_checkpoint.json``.  The
+    first call decodes the whole file and writes fresh outputs; later calls
+    append to them, so a refresh costs time proportional to the new data.
+    A file that has shrunk below the checkpoint (e.g. a swapped card) is
+    decoded again from the start.  Returns None when there is nothing new.
+    """
+    infile = Path(infile)
+    stem = infile.stem
+    ckpt_path = outdir / f"{stem}_checkpoint.json"
+    state = {"offset": 0, "last_time": None}
+    if ckpt_path.exists():
+        state = json.loads(ckpt_path.read_text())
+    size = infile.stat().st_size
+    if size < state["offset"]:
+        print(f"{infile.name} is smaller than the checkpoint; starting over")
+        state = {"offset": 0, "last_time": None}
+    if size - state["offset"] < REC_SIZE:
+        return None
+
+    try:
+        df, samples, meta = decode_wxt520(infile, offset=state["offset"])
+    except RuntimeError:
+        # no complete record appended yet, or only records with bad times:
+        # step past the latter so they are not decoded again on every call
+        buf = np.memmap(infile, dtype=np.uint8, mode="r")
+        starts, _, _ = _scan_records(buf, state["offset"])
+        if len(starts):
+            state["offset"] = int(starts[-1]) + REC_SIZE
+            outdir.mkdir(parents=True, exist_ok=True)
+            ckpt_path.write_text(json.dumps(state, indent=2))
+        return None
+    if state["last_time"] is not None:
+        keep = df.index > pd.Timestamp(state["last_time"])
+        df = df.loc[keep]
+        samples = samples.take(keep)
+
+    state["offset"] = meta["end_offset"]
+    if len(df):
+        meta["nrecs_decoded"] = int(len(df))
+        meta["time_start"] = df.index.min().isoformat()
+        meta["time_end"] = df.index.max().isoformat()
+        if state["last_time"] is None:
+            write_outputs(df, samples, meta, outdir, stem)
+        else:
+            append_outputs(df, samples, meta, outdir, stem)
+        state["last_time"] = meta["time_end"]
+    outdir.mkdir(parents=True, exist_ok=True)
+    ckpt_path.write_text(json.dumps(state, indent=2))
+    return (df, samples, meta) if len(df) else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("infile", type=Path, nargs="+",
+                   help="path to ASWXT*.DAT file(s); several files are "
+                        "decoded in parallel and merged")
+    p.add_argument("--outdir", type=Path, default=None,
+                   help="output directory (defaults to <infile_stem>_processed/, "
+                        "or ASWXT_merged_processed/ for several files)")
+    p.add_argument("--workers", type=int, default=None,
+                   help="processes for a multi-file decode "
+                        "(default: one per file, up to the CPU count)")
+    p.add_argument("--tstart", type=str, default=None,
+                   help="ISO start time to keep (UTC), inclusive")
+    p.add_argument("--tend", type=str, default=None,
+                   help="ISO end time to keep (UTC), inclusive")
+    p.add_argument("--sample-series", action="store_true",
+                   help="also write the 5-s wind samples as a time series "
+                        "(<stem>_wind_samples.parquet, or .csv without pyarrow)")
+    p.add_argument("--follow", action="store_true",
+                   help="decode only records appended since the last --follow "
+                        "run and append them to the outputs")
+    p.add_argument("--interval", type=float, default=0.0,
+                   help="with --follow, keep polling every INTERVAL seconds")
+    args = p.parse_args(argv)
+    if args.follow and (args.tstart or args.tend):
+        p.error("--follow cannot be combined with --tstart/--tend")
+    if args.follow and len(args.infile) > 1:
+        p.error("--follow takes a single infile")
+
+    if len(args.infile) == 1:
+        infile = args.infile[0]
+        stem = infile.stem
+    else:
+        infile = args.infile
+        stem = "ASWXT_merged"
+    outdir = args.outdir or (args.infile[0].parent / f"{stem}_processed")
+
+    if args.follow:
+        while True:
+            new = follow_wxt520(infile, outdir)
+            if new is None:
+                print(f"{infile.name}: no new records")
+            else:
+                df, _, meta = new
+                print(f"{infile.name}: appended {len(df)} records "
+                      f"({meta['time_start']} -> {meta['time_end']})")
+            if args.interval <= 0:
+                return 0
+            time.sleep(args.interval)
+
+    df, samples, meta = decode_wxt520(infile, args.tstart, args.tend,
+                                      workers=args.workers)
+    for path in write_outputs(df, samples, meta, outdir, stem):
+        print(f"  wrote {path}")
+    if args.sample_series:
+        series = wind_sample_series(samples)
+        try:
+            path = outdir / f"{stem}_wind_samples.parquet"
+            series.to_parquet(path)
+        except ImportError:
+            path = outdir / f"{stem}_wind_samples.csv"
+            series.to_csv(path)
+        print(f"  wrote {path}")
+
+    for m in meta.get("files", []):
+        name = Path(m["infile"]).name
+        if "error" in m:
+            print(f"  {name:<16s} skipped ({m['error']})")
+        else:
+            print(f"  {name:<16s} {m['nrecs_decoded']:8d} records "
+                  f"{m['seconds']:8.3f} s {m['MB_per_s']:8.1f} MB/s")
+    if "duplicates" in meta:
+        print(f"  dropped {meta['duplicates']} duplicate/backwards records "
+              f"in the merge")
 
-    print(f"  wrote {csv_path}")
-    print(f"  wrote {pkl_path}")
-    print(f"  wrote {meta_path}")
     print(f"\nDecoded {len(df)} records "
           f"from {meta['time_start']} to {meta['time_end']}")
     print(f"  module_sn   = {meta['module_sn']}")
     print(f"  sensor_sn   = {meta['sensor_sn']}")
+    for key, runs in meta["serial_ranges"].items():
+        if len(runs) > 1:
+            for r in runs:
+                print(f"    {key} {r['value']!r}: "
+                      f"{r['time_start']} -> {r['time_end']}")
     print(f"  firmware    = {meta['firmware_version']}")
     print(f"  bad CRC     = {meta['bad_crc']}")
     print(f"  bad time    = {meta['bad_time']}")
+    causes = {k: n for k, n in meta["bad_time_causes"].items() if n}
+    if causes:
+        print("    " + ", ".join(f"{k}: {n}" for k, n in causes.items()))
+    print(f"  resync      = {len(meta['resync'])}")
     return 0
 
 
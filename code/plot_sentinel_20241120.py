@@ -6,6 +6,9 @@ import matplotlib.dates as mdates
 import xarray as xr
 import pandas as pd
 
+from sentinel import load_sentinel
+from sentinel_plots import render_parameters
+
 # %%
 # set the directories
 test = "Field20241120"
@@ -31,12 +34,7 @@ ds = ds.sel(time=slice(shs_start_time, shs_end_time))
 
 # %%
 # read the sentinel 6 dataset
-df = pd.read_csv(sentinel_data_file)
-
-# %%
-# Set the time column as index
-df['time'] = pd.to_datetime(df['time'])
-df = df.set_index('time')
+df = load_sentinel(sentinel_data_file)
 
 # %%
 # sentinel 6 data
@@ -51,8 +49,8 @@ start_time = shs_start_time - timedelta(days=days_before)
 end_time = shs_end_time + timedelta(days=days_after)
 
 # Use floor/ceiling to normalize time boundaries for more robust selection
-start_floored = start_time.floor('H')  # Round down to nearest hour
-end_ceiling = end_time.ceil('H')       # Round up to nearest hour
+start_floored = start_time.floor('h')  # Round down to nearest hour
+end_ceiling = end_time.ceil('h')       # Round up to nearest hour
 
 print(f"Full data time range: {df.index.min()} to {df.index.max()}")
 print(f"SHS period: {shs_start_time} to {shs_end_time}")
@@ -95,88 +93,15 @@ print(f"Created directory for individual plots: {individual_plots_dir}")
 # Create individual plots for each parameter
 print(f"Creating individual plots for {len(parameters)} variables...")
 
-for param in parameters:
-    # Create a new figure for each parameter
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Plot title with SHS period information
-    plt.title(f'Sentinel 6: {param} with SHS period highlighted', fontsize=14)
-    
-    # Check for NaN values
-    if week_data[param].isna().all():
-        ax.text(0.5, 0.5, f"No data available for {param}", 
-                horizontalalignment='center', verticalalignment='center',
-                transform=ax.transAxes, fontsize=12)
-    else:
-        # Plot the data
-        ax.plot(week_data.index, week_data[param], 'b-', linewidth=2)
-        
-        # Calculate statistics
-        mean_val = week_data[param].mean()
-        max_val = week_data[param].max()
-        min_val = week_data[param].min()
-        std_val = week_data[param].std()
-        
-        # Add statistics box
-        stats_text = (f"Statistics:\n"
-                     f"Mean: {mean_val:.3f}\n"
-                     f"Max: {max_val:.3f}\n"
-                     f"Min: {min_val:.3f}\n"
-                     f"Std: {std_val:.3f}")
-        
-        ax.text(0.02, 0.95, stats_text, transform=ax.transAxes, fontsize=10,
-                bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.9))
-    
-    # Extend x-axis limits beyond the data to include SHS period
-    data_min = week_data.index.min()
-    data_max = week_data.index.max()
-    
-    # Ensure the x-axis includes the SHS period even if it's outside the data range
-    plot_min = min(data_min, shs_start_time - timedelta(hours=1))
-    plot_max = max(data_max, shs_end_time + timedelta(hours=1))
-    
-    ax.set_xlim(plot_min, plot_max)
-    
-    # Add SHS start and end time vertical lines
-    ax.axvline(x=shs_start_time, color='r', linestyle='--', 
-              linewidth=2, label='SHS Start')
-    ax.axvline(x=shs_end_time, color='g', linestyle='--', 
-              linewidth=2, label='SHS End')
-    
-    # Add shaded region between SHS start and end
-    ax.axvspan(shs_start_time, shs_end_time, alpha=0.2, color='yellow', label='SHS Period')
-    
-    # If the SHS period is outside our data range, add a note
-    if shs_start_time > data_max or shs_end_time < data_min:
-        ax.text(0.5, 0.5, "Note: SHS period is outside the available data range", 
-                horizontalalignment='center', verticalalignment='center',
-                transform=ax.transAxes, fontsize=12, 
-                bbox=dict(boxstyle="round,pad=0.5", fc="lightpink", alpha=0.8))
-    
-    # Labels and grid
-    ax.set_xlabel('Time', fontsize=12)
-    ax.set_ylabel(param, fontsize=12)
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper right')
-    
-    # Format x-axis
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d %H:%M'))
-    fig.autofmt_xdate()
-    
-    # Add footer
-    shs_duration = (shs_end_time - shs_start_time).total_seconds() / 60  # in minutes
-    # footer_text = f"Data period: {week_data.index.min().strftime('%Y-%m-%d %H:%M')} to {week_data.index.max().strftime('%Y-%m-%d %H:%M')}"
-    footer_text1 = f"SHS Period: {shs_start_time.strftime('%Y-%m-%d %H:%M')} to {shs_end_time.strftime('%Y-%m-%d %H:%M')} (Duration: {shs_duration:.1f} min)"
-    footer_text1 += f"\nclosest WFIP Station is #5, occupied by Sentinel 6. Lat: {lat_sentinel:.4f} Lon: {lon_sentinel:.4f}"
-    fig.text(0.5, 0.01, footer_text1, ha='center', fontsize=8, style='italic')
-    
-    # Save individual plot
-    # Clean parameter name for filename (replace special characters)
-    clean_param = param.replace("/", "_").replace(" ", "_").replace("(", "").replace(")", "")
-    individual_filename = f"{individual_plots_dir}/sentinel6_{clean_param}.png"
-    plt.tight_layout(rect=[0, 0.02, 1, 0.96])  # Adjusted to make room for two-line footer
-    plt.savefig(individual_filename, dpi=300, bbox_inches='tight')
-    plt.close()
+# Render the figures in parallel from one template per worker; the footer
+# and x-axis span are the same for every parameter
+shs_duration = (shs_end_time - shs_start_time).total_seconds() / 60  # in minutes
+# footer_text = f"Data period: {week_data.index.min().strftime('%Y-%m-%d %H:%M')} to {week_data.index.max().strftime('%Y-%m-%d %H:%M')}"
+footer_text1 = f"SHS Period: {shs_start_time.strftime('%Y-%m-%d %H:%M')} to {shs_end_time.strftime('%Y-%m-%d %H:%M')} (Duration: {shs_duration:.1f} min)"
+footer_text1 += f"\nclosest WFIP Station is #5, occupied by Sentinel 6. Lat: {lat_sentinel:.4f} Lon: {lon_sentinel:.4f}"
+plot_span = (shs_start_time - timedelta(hours=1), shs_end_time + timedelta(hours=1))
+render_parameters(week_data, parameters, shs_start_time, shs_end_time,
+                  individual_plots_dir, span=plot_span, footer=footer_text1)
 
 print(f"Created {len(parameters)} individual plots in {individual_plots_dir}")
 
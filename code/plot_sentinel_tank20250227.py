@@ -6,6 +6,8 @@ import matplotlib.dates as mdates
 import xarray as xr
 import pandas as pd
 
+from sentinel import load_sentinel
+
 # %%
 # set the directories
 test = "Lab20250227"
@@ -45,13 +47,8 @@ plt.savefig(f"{img_dir}/temperature_{test}.png")
 
 # %%
 # read the sentinel 6 dataset
-df = pd.read_csv(sentinel_data_file)
-
-
-# %%
-# Set the time column as index
-df['time'] = pd.to_datetime(df['time'])
-df = df.set_index('time')
+df = load_sentinel(sentinel_data_file,
+                   columns=["temperature_WXT", "temperature_HC2"])
 
 # plot the air temperature against shs data
 
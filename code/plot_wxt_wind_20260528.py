@@ -2,10 +2,9 @@
 from pathlib import Path
 
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
 
-from decode_wxt520_sd import decode_wxt520
+from decode_wxt520_sd import decode_wxt520, wind_vector_average
 
 
 REPO = Path(__file__).resolve().parents[1]
@@ -17,18 +16,17 @@ OUTPNG.parent.mkdir(parents=True, exist_ok=True)
 
 
 def main() -> None:
-    df, meta = decode_wxt520(INFILE)
-    df = df.loc[(df.index >= TSTART) & (df.index <= TEND)]
+    df, samples, meta = decode_wxt520(INFILE, TSTART, TEND)
     print(
         f"records={len(df)}  firmware={meta['firmware_version']}  "
         f"module_sn={meta['module_sn']}"
     )
 
-    n_samples = len(df["wdir11"].iloc[0])
-    t_rep = np.repeat(df.index.values, n_samples)
-    wdir = np.concatenate(df["wdir11"].to_list())
-    wspd = np.concatenate(df["wspd11"].to_list())
-    cmps = np.concatenate(df["compass11"].to_list())
+    n_samples = samples.wdir11.shape[1]
+    t_rep = samples.sample_times().ravel()  # each sample at its own time
+    wdir = samples.wdir11.ravel()
+    wspd = samples.wspd11.ravel()
+    cmps = samples.compass11.ravel()
 
     fig, axes = plt.subplots(5, 1, figsize=(10, 11), sharex=True)
 
@@ -93,6 +91,13 @@ def main() -> None:
             cmps.min(), cmps.mean(), cmps.max(), cmps.std()
         )
     )
+    # vector mean over every sample in the window (one row of all samples)
+    vec = wind_vector_average(wdir[None, :], wspd[None, :], cmps[None, :])
+    print(
+        "vecavg: wspd={:.3f}  wdir={:.1f}  compass={:.1f}".format(
+            vec["wspd"][0], vec["wdir"][0], vec["compass"][0]
+        )
+    )
     print(
         "atmp  : min={:.3f}  mean={:.3f}  max={:.3f}".format(
             df["atmp"].min(), df["atmp"].mean(), df["atmp"].max()
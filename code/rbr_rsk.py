@@ -3,13 +3,20 @@
 The RBR ``.rsk`` files are SQLite databases.  These helpers read the measured
 temperature channels directly, avoiding a dependency on ``pyrsktools`` for the
 simple two-channel RBRduo3 lab-test files used here.
+
+``RSK`` is a small stand-in for ``pyrsktools.RSK`` covering the calls used by
+the notebooks and scripts here (``open``/``close``, ``readdata``,
+``channelNames``/``channelUnits`` and the time range), so they can switch
+imports without pulling in ``pyrsktools``.
 """
 from __future__ import annotations
 
 import re
 import sqlite3
 from pathlib import Path
+from typing import NamedTuple
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 
@@ -61,6 +68,134 @@ def _channel_names(conn: sqlite3.Connection) -> list[str]:
     return names
 
 
+def _channel_units(conn: sqlite3.Connection) -> list[str]:
+    query = """
+        select channels.unitsPlainText
+        from instrumentChannels
+        join channels on channels.channelID = instrumentChannels.channelID
+        order by instrumentChannels.channelOrder
+    """
+    return [units or "" for (units,) in conn.execute(query).fetchall()]
+
+
+def _to_ms(value) -> int | None:
+    if value is None:
+        return None
+    return int(pd.Timestamp(value).value // 1_000_000)
+
+
+class Epoch(NamedTuple):
+    """Start and end of the logged samples, as ``datetime64[ms]``."""
+
+    startTime: np.datetime64
+    endTime: np.datetime64
+
+
+class RSK:
+    """Minimal ``pyrsktools.RSK`` look-alike backed by direct SQLite reads.
+
+    Only the subset used in this repository is implemented::
+
+        with RSK(path) as rsk:
+            rsk.readdata(t1, t2)
+            rsk.data["timestamp"], rsk.data["temperature"], ...
+
+    ``data`` is a structured array with a ``timestamp`` field
+    (``datetime64[ms]``) followed by one float64 field per channel, named as in
+    :func:`read_rbr_rsk`.
+    """
+
+    def __init__(self, filename: str | Path) -> None:
+        self.filename = Path(filename)
+        self.channelNames: list[str] = []
+        self.channelUnits: list[str] = []
+        self.data = np.empty(0, dtype=[("timestamp", "datetime64[ms]")])
+        self._conn: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "RSK":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the file and read the channel table."""
+        if self._conn is not None:
+            return
+        if not self.filename.exists():
+            raise FileNotFoundError(self.filename)
+        self._conn = _connect_readonly(self.filename)
+        self._channel_cols = [
+            row[1]
+            for row in self._conn.execute("pragma table_info(data)").fetchall()
+            if row[1].startswith("channel")
+        ]
+        names = _channel_names(self._conn)
+        units = _channel_units(self._conn)
+        if len(names) != len(self._channel_cols):
+            names = [f"channel{i + 1:02d}" for i in range(len(self._channel_cols))]
+            units = [""] * len(names)
+        self.channelNames = names
+        self.channelUnits = units
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def epoch(self) -> Epoch:
+        """Time range of the samples in the ``data`` table."""
+        self._require_open()
+        t0, t1 = self._conn.execute(
+            "select min(tstamp), max(tstamp) from data"
+        ).fetchone()
+        if t0 is None:
+            nat = np.datetime64("NaT", "ms")
+            return Epoch(nat, nat)
+        return Epoch(np.datetime64(int(t0), "ms"), np.datetime64(int(t1), "ms"))
+
+    def readdata(self, t1=None, t2=None) -> None:
+        """Read samples with ``t1 <= timestamp <= t2`` into ``self.data``.
+
+        Either bound may be omitted; both accept anything
+        :class:`pandas.Timestamp` understands.  The range is applied in the
+        SQL query, so only the requested rows are fetched.
+        """
+        self._require_open()
+        cols = ", ".join(["tstamp", *self._channel_cols])
+        where, params = [], []
+        for op, bound in ((">=", t1), ("<=", t2)):
+            ms = _to_ms(bound)
+            if ms is not None:
+                where.append(f"tstamp {op} ?")
+                params.append(ms)
+        sql = f"select {cols} from data"
+        if where:
+            sql += " where " + " and ".join(where)
+        sql += " order by tstamp"
+        rows = self._conn.execute(sql, params).fetchall()
+
+        dtype = [("timestamp", "datetime64[ms]")] + [
+            (name, "f8") for name in self.channelNames
+        ]
+        data = np.empty(len(rows), dtype=dtype)
+        if rows:
+            values = np.array(rows, dtype=np.float64)
+            data["timestamp"] = values[:, 0].astype(np.int64).astype(
+                "datetime64[ms]"
+            )
+            for i, name in enumerate(self.channelNames, start=1):
+                data[name] = values[:, i]
+        self.data = data
+
+    def _require_open(self) -> None:
+        if self._conn is None:
+            raise RuntimeError(f"{self.filename} is not open; call open() first")
+
+
 def read_rbr_rsk(path: str | Path) -> xr.Dataset:
     """Read a simple RBR ``.rsk`` SQLite file into an xarray Dataset."""
     path = Path(path)
@@ -0,0 +1,291 @@
+"""Per-segment statistics for time series cut into intervals.
+
+The lab scripts summarise every variable over every interval between note
+events (IN / OUT / ...).  Doing that with one boolean mask per interval and a
+``np.nanmean`` per variable is O(intervals x samples x variables).  Here each
+sample is given a segment id once (``segment_ids``, a ``searchsorted`` on the
+interval edges), the samples are put in segment order (a no-op for a time
+series cut at increasing edges), and count / mean / std / min / max of all
+variables over all segments come out of a handful of ``ufunc.reduceat``
+calls on the stacked ``(samples, variables)`` array.
+
+``window_stats`` does the same for explicit (start, end, label) windows over
+a time-indexed frame, e.g. the air windows of a multi-instrument comparison:
+windows may overlap or leave gaps, so they are summed from cumulative sums
+indexed by a ``searchsorted`` of the window ends, and windows that share a
+label are pooled.
+
+``block_average`` is the fixed-width-bin case (``DataFrame.resample``): bin
+ids come straight from the integer timestamps and count / sum / mean / std
+of all variables are accumulated with ``np.bincount``.
+
+NaNs are ignored, as in ``np.nanmean`` / ``np.nanstd`` (``std`` is the
+population standard deviation, ``ddof=0``).
+"""
+from __future__ import annotations
+
+from typing import Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+STATS = ("count", "mean", "std", "min", "max")
+
+
+def segment_ids(times, edges) -> np.ndarray:
+    """Index of the interval ``edges[i] <= t < edges[i + 1]`` holding each of
+    ``times`` (-1 before the first edge, ``len(edges) - 1`` after the last).
+
+    ``edges`` must be sorted; both are converted to ``datetime64[ns]`` if
+    they are times.
+    """
+    times, edges = np.asarray(times), np.asarray(edges)
+    if np.issubdtype(times.dtype, np.datetime64) or times.dtype == object:
+        times = pd.DatetimeIndex(times).to_numpy()
+        edges = pd.DatetimeIndex(edges).to_numpy()
+    return np.searchsorted(edges, times, side="right") - 1
+
+
+def _stack(values) -> tuple[list[str], np.ndarray]:
+    """Names and a C-contiguous (variables, samples) float array, so each
+    variable is reduced along contiguous memory."""
+    if isinstance(values, pd.DataFrame):
+        names = [str(c) for c in values.columns]
+        x = values.to_numpy(dtype=float).T  # frames are usually column-major
+    elif isinstance(values, Mapping):
+        names = [str(k) for k in values]
+        x = np.vstack([np.asarray(v, dtype=float).ravel() for v in values.values()])
+    else:
+        x = np.asarray(values, dtype=float)
+        x = x.reshape(len(x), -1).T
+        names = [f"x{i}" for i in range(len(x))]
+    return names, np.ascontiguousarray(x)
+
+
+def segment_stats(segments, values) -> pd.DataFrame:
+    """Count / mean / std / min / max of every variable in every segment.
+
+    Parameters
+    ----------
+    segments : integer array, one segment id per sample (e.g. from
+        ``segment_ids`` or ``shs_notes.Notes.segment``).
+    values : DataFrame, mapping of name -> array, or a 1-D / 2-D array with
+        one row per sample.
+
+    Returns
+    -------
+    Tidy DataFrame with one row per (segment, variable) for the segments
+    that have samples, in segment order, with columns ``segment``,
+    ``variable``, ``length`` (samples in the segment, NaN or not), ``count``
+    (non-NaN samples), ``mean``, ``std``, ``min`` and ``max``.
+    """
+    seg = np.asarray(segments).ravel()
+    names, x = _stack(values)
+    if len(seg) != x.shape[1]:
+        raise ValueError(f"{len(seg)} segment ids for {x.shape[1]} samples")
+    if len(seg) == 0:
+        return pd.DataFrame(columns=["segment", "variable", "length", *STATS])
+
+    if np.any(seg[1:] < seg[:-1]):
+        order = np.argsort(seg, kind="stable")
+        seg, x = seg[order], x[:, order]
+
+    starts = np.flatnonzero(np.r_[True, seg[1:] != seg[:-1]])
+    lengths = np.diff(np.r_[starts, len(seg)])
+    ok = np.isfinite(x)
+    count = np.add.reduceat(ok, starts, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.add.reduceat(np.where(ok, x, 0.0), starts, axis=1) / count
+        dev = np.where(ok, x - np.repeat(mean, lengths, axis=1), 0.0)
+        std = np.sqrt(np.add.reduceat(dev * dev, starts, axis=1) / count)
+    lo = np.fmin.reduceat(x, starts, axis=1)
+    hi = np.fmax.reduceat(x, starts, axis=1)
+
+    k = len(names)
+    return pd.DataFrame({
+        "segment": np.repeat(seg[starts], k),
+        "variable": np.tile(names, len(starts)),
+        "length": np.repeat(lengths, k),
+        "count": count.T.ravel(),
+        "mean": mean.T.ravel(),
+        "std": std.T.ravel(),
+        "min": lo.T.ravel(),
+        "max": hi.T.ravel(),
+    })
+
+
+class BlockStats(NamedTuple):
+    """Fixed-width time-bin statistics from ``block_average``; the arrays are
+    (bins, variables)."""
+
+    time: np.ndarray  # datetime64, left edge of each bin
+    names: tuple[str, ...]
+    count: np.ndarray
+    sum: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+
+    def frame(self, stat: str = "mean") -> pd.DataFrame:
+        """One statistic as a DataFrame indexed by bin time."""
+        return pd.DataFrame(getattr(self, stat), columns=list(self.names),
+                            index=pd.DatetimeIndex(self.time, name="time"))
+
+    def to_xarray(self):
+        """Dataset with ``<name>`` (mean), ``<name>_std`` and
+        ``<name>_count`` on a ``time`` dimension (needs xarray)."""
+        import xarray as xr
+
+        data = {}
+        for i, name in enumerate(self.names):
+            data[name] = ("time", self.mean[:, i])
+            data[f"{name}_std"] = ("time", self.std[:, i])
+            data[f"{name}_count"] = ("time", self.count[:, i])
+        return xr.Dataset(data, coords={"time": self.time})
+
+
+def block_average(times, values, freq="3s", fill: bool = True) -> BlockStats:
+    """Average ``values`` into fixed ``freq`` time bins.
+
+    Bins are ``[k * freq, (k + 1) * freq)`` counted from the Unix epoch (for
+    a ``freq`` that divides a day these are the bins ``DataFrame.resample``
+    uses) and are labelled by their left edge.  Bin ids come from the
+    integer timestamps, and count / sum / mean / std of every variable come
+    from ``np.bincount`` over those ids (no sort, no grouper), so the result
+    matches ``df.resample(freq).agg(["count", "sum", "mean", "std"])``
+    except that ``std`` is the population standard deviation (``ddof=0``).
+
+    With ``fill`` every bin from the first to the last sample is returned
+    (empty bins have count 0 and NaN mean/std, as in pandas); otherwise only
+    bins that hold samples.
+
+    Returns
+    -------
+    BlockStats (``.frame()`` for a DataFrame, ``.to_xarray()`` for a Dataset).
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_frame()
+    names, x = _stack(values)
+    index = pd.DatetimeIndex(times)
+    t = index.asi8
+    if len(t) != x.shape[1]:
+        raise ValueError(f"{len(t)} times for {x.shape[1]} samples")
+    k = len(names)
+    if len(t) == 0:
+        empty = np.zeros((0, k))
+        return BlockStats(np.array([], dtype=f"datetime64[{index.unit}]"),
+                          tuple(names), empty.astype(int), empty, empty, empty)
+
+    step = int(pd.Timedelta(freq) // pd.Timedelta(1, unit=index.unit))
+    bins = t // step
+    first = bins.min()
+    pos = bins - first
+    n_bins = int(pos.max()) + 1
+
+    # one column at a time through preallocated (samples,) buffers: the
+    # bincounts are already vectorised over samples, and full (variables,
+    # samples) temporaries cost more in page faults than the loop does.
+    # NaNs are usually rare, so they are handled by index.
+    n_all = np.bincount(pos, minlength=n_bins)
+    count = np.empty((k, n_bins), dtype=n_all.dtype)
+    total = np.empty((k, n_bins))
+    ss = np.empty((k, n_bins))
+    ok = np.empty(len(t), dtype=bool)
+    xj = np.empty(len(t))
+    dev = np.empty(len(t))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for j in range(k):
+            np.isfinite(x[j], out=ok)
+            np.copyto(xj, x[j])
+            bad = np.flatnonzero(~ok) if not ok.all() else None
+            count[j] = n_all
+            if bad is not None:
+                xj[bad] = 0.0
+                count[j] -= np.bincount(pos[bad], minlength=n_bins)
+            total[j] = np.bincount(pos, weights=xj, minlength=n_bins)
+            # second pass about the bin means, so the variance is not the
+            # difference of two large numbers
+            np.take(total[j] / count[j], pos, out=dev)
+            np.subtract(xj, dev, out=dev)
+            if bad is not None:
+                dev[bad] = 0.0
+            np.multiply(dev, dev, out=dev)
+            ss[j] = np.bincount(pos, weights=dev, minlength=n_bins)
+        mean = total / count
+        std = np.sqrt(ss / count)
+
+    keep = slice(None) if fill else count.any(axis=0)
+    time = (first + np.arange(n_bins)) * step
+    return BlockStats(time[keep].astype(f"datetime64[{index.unit}]"),
+                      tuple(names), count.T[keep], total.T[keep],
+                      mean.T[keep], std.T[keep])
+
+
+def window_stats(frame: pd.DataFrame, windows, columns=None) -> pd.DataFrame:
+    """Count / mean / std / RMS of ``columns`` of ``frame`` in each window.
+
+    Parameters
+    ----------
+    frame : DataFrame with a sorted DatetimeIndex.
+    windows : iterable of ``(start, end, ..., label)``; samples with
+        ``start <= time <= end`` are in the window, and ``None`` leaves that
+        end open.  Windows with the same label are pooled into one row (they
+        should not overlap).  ``shs_notes.Interval`` tuples work as is.
+    columns : columns to summarise (default all).
+
+    Returns
+    -------
+    Tidy DataFrame with one row per (window, variable), in the order the
+    labels first appear, with columns ``window``, ``variable``, ``count``
+    (non-NaN samples), ``mean``, ``std`` and ``rms`` (root mean square, i.e.
+    the RMS difference when the column is a difference between instruments).
+    Windows with no samples have ``count`` 0 and NaN statistics.
+    """
+    columns = list(frame.columns if columns is None else columns)
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    windows = [(w[0], w[1], w[-1]) for w in windows]
+    x = frame[columns].to_numpy(dtype=float)
+    ok = np.isfinite(x)
+    # centre each column before summing squares so the variance does not
+    # come from differencing two large cumulative sums
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centre = np.where(ok, x, 0.0).sum(axis=0) / ok.sum(axis=0)
+    centre = np.nan_to_num(centre)
+    y = np.where(ok, x - centre, 0.0)
+
+    def cumsum(a):
+        return np.concatenate([np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)])
+
+    c_n, c_y, c_yy = cumsum(ok), cumsum(y), cumsum(y * y)
+    index = frame.index
+    lo = np.array([0 if t0 is None
+                   else index.searchsorted(pd.Timestamp(t0), "left")
+                   for t0, _, _ in windows], dtype=int)
+    hi = np.array([len(index) if t1 is None
+                   else index.searchsorted(pd.Timestamp(t1), "right")
+                   for _, t1, _ in windows], dtype=int)
+    hi = np.maximum(hi, lo)
+
+    codes, labels = pd.factorize(pd.Index([str(w[2]) for w in windows]))
+    n = np.zeros((len(labels), len(columns)))
+    s_y = np.zeros_like(n)
+    s_yy = np.zeros_like(n)
+    np.add.at(n, codes, c_n[hi] - c_n[lo])
+    np.add.at(s_y, codes, c_y[hi] - c_y[lo])
+    np.add.at(s_yy, codes, c_yy[hi] - c_yy[lo])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        m_y = s_y / n
+        var = np.maximum(s_yy / n - m_y * m_y, 0.0)
+    mean = m_y + centre
+    rms = np.sqrt(var + mean * mean)
+
+    k = len(columns)
+    return pd.DataFrame({
+        "window": np.repeat(np.asarray(labels, dtype=object), k),
+        "variable": np.tile(columns, len(labels)),
+        "count": n.ravel().astype(int),
+        "mean": mean.ravel(),
+        "std": np.sqrt(var).ravel(),
+        "rms": rms.ravel(),
+    })
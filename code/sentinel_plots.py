@@ -0,0 +1,221 @@
+"""Render the per-parameter Sentinel figures in parallel.
+
+The ``plot_sentinel_*`` scripts draw one figure per numeric Sentinel channel
+(~27 of them) around the SHS test period and save each at ``dpi=300`` with
+``bbox_inches='tight'``; rasterising and writing those PNGs is nearly all of
+the time a script takes.  ``render_parameters`` fans the channels out to a
+process pool.  Each worker builds one ``FigureTemplate`` -- the figure, axes,
+SHS start / end lines and shading, legend, date axis and footer, which are
+the same for every channel -- on the Agg canvas directly (no pyplot, so the
+caller's interactive backend is never touched), and then per channel only
+swaps in the data line, title, y label and statistics box before saving.
+
+The plot scripts are notebook-style, with no ``__main__`` guard, so the
+workers are forked rather than spawned (a spawned worker would re-run the
+script).  Forking is only done on Linux: on macOS a forked child can crash
+in system frameworks that matplotlib or numpy have already loaded, and
+Windows has no ``fork``, so elsewhere the figures are rendered in the
+calling process.  Each figure's render time is reported, as well as the
+wall time and the number of workers.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import matplotlib.dates as mdates
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+DPI = 300
+LAYOUT_RECT = (0, 0.02, 1, 0.96)  # leaves room for a two-line footer
+
+
+class FigureTiming(NamedTuple):
+    """One rendered figure."""
+
+    param: str
+    path: Path
+    seconds: float
+    pid: int
+
+
+def clean_name(param: str) -> str:
+    """Channel name made safe for a file name."""
+    return (param.replace("/", "_").replace(" ", "_")
+            .replace("(", "").replace(")", ""))
+
+
+class FigureTemplate:
+    """A Sentinel channel figure whose channel-independent parts are drawn
+    once; ``render`` fills in one channel and saves it."""
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        shs_start: pd.Timestamp,
+        shs_end: pd.Timestamp,
+        out_dir: str | Path,
+        span: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        footer: str = "",
+        prefix: str = "sentinel6_",
+        title: str = "Sentinel 6: {param} with SHS period highlighted",
+        dpi: int = DPI,
+    ):
+        self.data = data
+        self.out_dir = Path(out_dir)
+        self.prefix = prefix
+        self.title_format = title
+        self.dpi = dpi
+
+        fig = Figure(figsize=(12, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        self.fig, self.ax = fig, ax
+        self.title = ax.set_title("", fontsize=14)
+        self.line, = ax.plot(data.index[:0], [], "b-", linewidth=2)
+
+        # the x-axis takes in the SHS period (or ``span``) even if it falls
+        # outside the data
+        data_min, data_max = data.index.min(), data.index.max()
+        lo, hi = span if span is not None else (shs_start, shs_end)
+        ax.set_xlim(min(data_min, lo), max(data_max, hi))
+        ax.axvline(x=shs_start, color="r", linestyle="--",
+                   linewidth=2, label="SHS Start")
+        ax.axvline(x=shs_end, color="g", linestyle="--",
+                   linewidth=2, label="SHS End")
+        ax.axvspan(shs_start, shs_end, alpha=0.2, color="yellow",
+                   label="SHS Period")
+        if shs_start > data_max or shs_end < data_min:
+            ax.text(0.5, 0.5, "Note: SHS period is outside the available data range",
+                    horizontalalignment="center", verticalalignment="center",
+                    transform=ax.transAxes, fontsize=12,
+                    bbox=dict(boxstyle="round,pad=0.5", fc="lightpink", alpha=0.8))
+
+        ax.set_xlabel("Time", fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc="upper right")
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d %H:%M"))
+        fig.autofmt_xdate()
+        if footer:
+            fig.text(0.5, 0.01, footer, ha="center", fontsize=8, style="italic")
+        # tight_layout starts from the current subplot parameters, so each
+        # figure is laid out from these rather than from the previous one
+        sp = fig.subplotpars
+        self.subplotpars = dict(left=sp.left, bottom=sp.bottom,
+                                right=sp.right, top=sp.top)
+
+    def render(self, param: str) -> FigureTiming:
+        """Draw ``param`` into the template and save it as
+        ``<out_dir>/<prefix><param>.png``."""
+        t0 = time.perf_counter()
+        ax = self.ax
+        y = self.data[param]
+        self.title.set_text(self.title_format.format(param=param))
+        ax.set_ylabel(param, fontsize=12)
+        if y.isna().all():
+            self.line.set_data(self.data.index[:0], [])
+            ax.set_ylim(0, 1)
+            note = ax.text(0.5, 0.5, f"No data available for {param}",
+                           horizontalalignment="center", verticalalignment="center",
+                           transform=ax.transAxes, fontsize=12)
+        else:
+            self.line.set_data(y.index, y.to_numpy())
+            ax.set_autoscaley_on(True)
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+            stats_text = (f"Statistics:\n"
+                          f"Mean: {y.mean():.3f}\n"
+                          f"Max: {y.max():.3f}\n"
+                          f"Min: {y.min():.3f}\n"
+                          f"Std: {y.std():.3f}")
+            note = ax.text(0.02, 0.95, stats_text, transform=ax.transAxes, fontsize=10,
+                           bbox=dict(boxstyle="round,pad=0.5", fc="white", alpha=0.9))
+
+        path = self.out_dir / f"{self.prefix}{clean_name(param)}.png"
+        self.fig.subplots_adjust(**self.subplotpars)
+        self.fig.tight_layout(rect=LAYOUT_RECT)
+        self.fig.savefig(path, dpi=self.dpi, bbox_inches="tight")
+        note.remove()
+        return FigureTiming(param, path, time.perf_counter() - t0, os.getpid())
+
+
+_template: FigureTemplate | None = None
+
+
+def _init_worker(kwargs: dict) -> None:
+    global _template
+    _template = FigureTemplate(**kwargs)
+
+
+def _render(param: str) -> FigureTiming:
+    return _template.render(param)
+
+
+def render_parameters(
+    data: pd.DataFrame,
+    parameters: list[str],
+    shs_start: pd.Timestamp,
+    shs_end: pd.Timestamp,
+    out_dir: str | Path,
+    span: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+    footer: str = "",
+    workers: int | None = None,
+    verbose: bool = True,
+    **template,
+) -> list[FigureTiming]:
+    """Save one figure per channel in ``parameters`` to ``out_dir``.
+
+    Parameters
+    ----------
+    data : time-indexed Sentinel frame, already cut to the plot window.
+    parameters : channels to plot.
+    shs_start, shs_end : SHS test period, marked on every figure.
+    out_dir : directory for the PNGs (created if missing).
+    span : times the x-axis must include besides the data (default the SHS
+        period).
+    footer : text under each figure.
+    workers : processes to use (default ``os.cpu_count()``); 1 renders in
+        this process, as is always done off Linux.
+    verbose : print each figure's render time and the total.
+    **template : passed on to ``FigureTemplate`` (``prefix``, ``title``,
+        ``dpi``).
+
+    Returns
+    -------
+    list of FigureTiming, in the order of ``parameters``.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    kwargs = dict(data=data[list(parameters)], shs_start=shs_start,
+                  shs_end=shs_end, out_dir=out_dir, span=span, footer=footer,
+                  **template)
+    workers = min(workers or os.cpu_count() or 1, len(parameters))
+    if not sys.platform.startswith("linux"):
+        workers = 1
+
+    t0 = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(workers, multiprocessing.get_context("fork"),
+                                 initializer=_init_worker,
+                                 initargs=(kwargs,)) as pool:
+            timings = list(pool.map(_render, parameters))
+    else:
+        fig = FigureTemplate(**kwargs)
+        timings = [fig.render(p) for p in parameters]
+    wall = time.perf_counter() - t0
+
+    if verbose:
+        for t in timings:
+            print(f"  {t.param:<24s} {t.seconds:6.2f} s  {t.path.name}")
+        busy = sum(t.seconds for t in timings)
+        print(f"Rendered {len(timings)} figures in {wall:.1f} s on "
+              f"{max(workers, 1)} worker(s) ({busy:.1f} s of figure time)")
+    return timings
@@ -0,0 +1,240 @@
+"""Parse the hand-written SHS test notes into event and state-interval indexes.
+
+Each test directory under ``data/`` has a notes file
+(``20260528Lab/20260528_SHS-test-notes_EGH.txt``,
+``20260520Lab/20260520_SHS-NOTES_EGH.txt``, ...) with timed lines such as::
+
+    13:11z - SHS IN tank
+    18:48:30z - submerged in tank
+    15:18 - OUT
+    •	1627 sensor turned on      (2024 field notes: bulleted HHMM)
+
+and date lines (``2026-05-28 - SHS test``, ``2026/05/29``, ``20260122``) that
+set the day for the times below them; until a date line is seen, a date
+embedded in a header (``Humditiy sensor test 20241118``) sets it.
+``parse_notes`` classifies every timed line as ``IN`` / ``OUT`` / ``dunk``
+(a quick dunk in water, back in air straight after) / ``start`` / ``OFF``
+(anything else is a plain ``note`` that does not change state) and returns
+the events sorted by time with the sensor state (``air`` / ``water`` /
+``off``) in force after each one.  Times are taken as written: a time that
+goes backwards (the last two lines of the 20241118 notes) is not moved to
+the next day.
+A whole timestamp array is then labelled with a single ``searchsorted``
+(``Notes.segment`` / ``Notes.state_at``), and the IN / air windows used by
+the comparison scripts come from ``Notes.intervals`` instead of hand-copied
+lists, so a new test only needs its notes file.
+
+Usage:
+    python shs_notes.py [test ...]    # e.g. 20260528Lab; default: all tests
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+REPO = Path(__file__).resolve().parents[1]
+DATA = REPO / "data"
+
+_DATE = re.compile(r"^\s*(\d{4})[-/]?(\d{2})[-/]?(\d{2})(?!\d)")
+_HEADER_DATE = re.compile(r"(?<!\d)(20\d{2})(\d{2})(\d{2})(?!\d)")
+_TIME = re.compile(
+    r"^\s*(?:(\d{4})[-/]?(\d{2})[-/]?(\d{2})\s+)?"  # optional date prefix
+    r"~?(\d{1,2}):(\d{2})(?::(\d{2}))?\s*[zZ]?\s*-\s*(.*?)\s*$"
+)
+_BULLET_TIME = re.compile(r"^\s*[\u2022*-]\s*(\d{2})(\d{2})\s+(.*?)\s*$")
+# checked in this order; the capitalised IN / OUT / OFF are case-sensitive so
+# "note in wxt data" is not an IN.  dunk comes before start ("dunk/wet - but
+# not turned on"), and only the sensor being switched on is a start, not
+# "fan on".
+_KINDS = [
+    ("OUT", re.compile(r"\bOUT\b|(?i:\bremoved?\b|\bout (of|in front)\b)")),
+    ("IN", re.compile(r"\bIN\b|(?i:\bsubmerged?\b|\bin (the )?(water|tank)\b)")),
+    ("dunk", re.compile(r"(?i:\bdunk(ed)?\b|\bwet\b)")),
+    ("OFF", re.compile(r"\bOFF\b|(?i:\bstop(ped)?\b|\bended\b|\bturn(ed)? off\b)")),
+    ("start", re.compile(r"(?i:\bstart(ed)?\b|\bturn(ed)? on\b"
+                         r"|\b(shs|rbr|sensor|unit) on\b)")),
+]
+STATE_AFTER = {"IN": "water", "OUT": "air", "dunk": "air", "start": "air",
+               "OFF": "off"}
+
+
+class Interval(NamedTuple):
+    """A run of constant state between two note events."""
+
+    t0: pd.Timestamp
+    t1: pd.Timestamp | None  # None for the run after the last event
+    state: str
+    label: str
+
+
+class Notes(NamedTuple):
+    """The events of one test, sorted by time."""
+
+    test: str
+    day: str  # first date in the file, YYYY-MM-DD
+    times: np.ndarray  # datetime64[s]
+    kinds: np.ndarray  # "IN" | "OUT" | "dunk" | "start" | "OFF" | "note"
+    states: np.ndarray  # state from each event until the next one
+    text: tuple[str, ...]
+
+    def segment(self, times) -> np.ndarray:
+        """Index of the event in force at each of ``times`` (-1 before the
+        first event)."""
+        t = np.asarray(pd.DatetimeIndex(np.atleast_1d(times)).to_numpy())
+        return np.searchsorted(self.times, t, side="right") - 1
+
+    def state_at(self, times, before: str = "air") -> np.ndarray:
+        """Sensor state at each of ``times``; ``before`` applies ahead of
+        the first note (the sensor is set up in air)."""
+        seg = self.segment(times)
+        return np.where(seg >= 0, self.states[np.maximum(seg, 0)], before)
+
+    def intervals(self, state: str | None = None) -> list[Interval]:
+        """Runs of constant state between events, optionally only those in
+        ``state``.  The run after the last event has no end (``t1`` is
+        None); ``window_stats`` treats that as open-ended.
+
+        Water runs are labelled ``IN-1``, ``IN-2``, ...; an air run is
+        labelled after the water run before it (``air-0`` before the first
+        IN, ``air-1`` after IN-1, ...).
+        """
+        change = np.r_[True, self.states[1:] != self.states[:-1]]
+        starts = np.flatnonzero(change)
+        runs = []
+        n_in = 0
+        for i, j in zip(starts, [*starts[1:], None]):
+            st = str(self.states[i])
+            if st == "water":
+                n_in += 1
+                label = f"IN-{n_in}"
+            else:
+                label = f"{st}-{n_in}"
+            t1 = None if j is None else pd.Timestamp(self.times[j])
+            runs.append(Interval(pd.Timestamp(self.times[i]), t1, st, label))
+        if state is not None:
+            runs = [r for r in runs if r.state == state]
+        return runs
+
+
+def classify(text: str) -> str:
+    """Event kind of one note line's text."""
+    for kind, pattern in _KINDS:
+        if pattern.search(text):
+            return kind
+    return "note"
+
+
+def parse_notes(lines, test: str = "") -> Notes:
+    """Build ``Notes`` from the lines of a notes file."""
+    day = None
+    first_day = None
+    times, kinds, text = [], [], []
+    for line in lines:
+        m = _TIME.match(line)
+        if m and m[1]:
+            day = f"{m[1]}-{m[2]}-{m[3]}"
+            first_day = first_day or day
+        if m:
+            hh, mm, ss, note = m.groups()[3:]
+        else:
+            m = _BULLET_TIME.match(line)
+            if m:
+                (hh, mm, note), ss = m.groups(), None
+        if m and day is not None:
+            times.append(np.datetime64(day)
+                         + np.timedelta64(int(hh) * 3600 + int(mm) * 60
+                                          + int(ss or 0), "s"))
+            kinds.append(classify(note))
+            text.append(note)
+            continue
+        m = _DATE.match(line) or (day is None and _HEADER_DATE.search(line))
+        if m and 1 <= int(m[2]) <= 12 and 1 <= int(m[3]) <= 31:
+            day = "-".join(m.groups())
+            first_day = first_day or day
+    if not times:
+        raise ValueError(f"no timed events in the notes for {test!r}")
+
+    times = np.array(times, dtype="datetime64[s]")
+    order = np.argsort(times, kind="stable")
+    kinds = np.array(kinds, dtype=object)[order]
+    states = []
+    state = "air"
+    for kind in kinds:
+        state = STATE_AFTER.get(kind, state)
+        states.append(state)
+    return Notes(test, first_day, times[order], kinds, np.array(states),
+                 tuple(text[i] for i in order))
+
+
+def find_notes(test: str | Path) -> Path:
+    """The notes file for a test directory name (``20260528Lab``), a test
+    directory or the notes file itself.
+
+    Of the ``*note*.txt`` files in the directory, those that also name the
+    SHS (``*SHS*note*``) are preferred, so e.g. ``meeting_notes.txt`` next to
+    the test notes is passed over.  More than one remaining candidate is an
+    error rather than a guess.
+    """
+    path = Path(test)
+    if path.is_file():
+        return path
+    if not path.is_dir():
+        path = DATA / test
+    found = sorted(p for p in path.glob("*.txt") if "note" in p.name.lower())
+    if not found:
+        raise FileNotFoundError(f"no *notes*.txt in {path}")
+    shs = [p for p in found if re.search(r"shs.*note", p.name.lower())]
+    found = shs or found
+    if len(found) > 1:
+        raise ValueError(f"more than one notes file in {path}: "
+                         f"{', '.join(p.name for p in found)}")
+    return found[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path: Path, mtime: float) -> Notes:
+    with path.open(encoding="utf-8", errors="replace") as f:
+        return parse_notes(f, path.parent.name)
+
+
+def load_notes(test: str | Path) -> Notes:
+    """Parsed notes for a test, cached until the file changes."""
+    path = find_notes(test).absolute()
+    return _load(path, path.stat().st_mtime)
+
+
+def all_tests() -> list[str]:
+    """Test directories under ``data/`` that have a notes file."""
+    return sorted({p.parent.name for p in DATA.glob("20*/*.txt")
+                   if "note" in p.name.lower()})
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("tests", nargs="*", help="test directories under data/")
+    args = p.parse_args(argv)
+    for test in args.tests or all_tests():
+        try:
+            notes = load_notes(test)
+        except ValueError as err:
+            print(f"== {test}: {err}")
+            continue
+        print(f"== {test} ({find_notes(test).name})")
+        for t, kind, state, text in zip(notes.times, notes.kinds,
+                                        notes.states, notes.text):
+            print(f"  {str(t):<20s} {kind:<6s} -> {state:<6s} {text}")
+        for iv in notes.intervals():
+            print(f"  {iv.label:<8s} {iv.state:<6s} {iv.t0} -> {iv.t1}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
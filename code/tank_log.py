@@ -0,0 +1,276 @@
+"""Read the Seabird GPCTD tank logs written by the bench terminal program.
+
+Each sample is one line::
+
+    [2026-05-28 13:07:29.819]     0.16, 17.6454, 3.91483
+    [Tue Dec 09 18:18:21.776 2025]     0.32, 17.9877, 3.85820
+
+i.e. a bracketed PC timestamp (ISO in the 2026 logs, ctime-style in the
+December 2025 tank test; ``sniff_time_format`` tells them apart) followed by
+pressure (dbar), temperature (deg C) and conductivity (S/m).  The logs also
+contain blank lines, terminal markers such as ``<!--start logging-->`` and
+occasionally lines without a timestamp; those are skipped.
+
+Rather than matching every line with a regex, the brackets are translated
+away (``[`` to a space, ``]`` to a comma) so the whole block parses in one
+pass of the pandas C CSV reader, and the timestamps are converted with a
+single explicit datetime format.  ``iter_tank_ct`` does the same on
+fixed-size byte chunks for logs that should not be read in one go.
+
+During a test, ``follow_tank_log`` tails the growing log with asyncio and
+keeps the most recent samples in a ``TankBuffer`` that can be queried by time.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ("p_dbar", "T_C", "C_Sm")
+# timestamp formats seen in the logs, tried in order by sniff_time_format
+TIME_FORMATS = {
+    "iso": "%Y-%m-%d %H:%M:%S.%f",
+    "ctime": "%a %b %d %H:%M:%S.%f %Y",
+}
+TIME_FORMAT = TIME_FORMATS["iso"]
+MONTHS = {m: f"{i:02d}" for i, m in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+     "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], start=1)}
+SNIFF_BYTES = 1 << 16
+CHUNK_BYTES = 1 << 22
+
+_UNBRACKET = bytes.maketrans(b"[]", b" ,")
+
+
+def sniff_time_format(head: bytes) -> str:
+    """Pick the ``TIME_FORMATS`` entry that parses every bracketed timestamp
+    in ``head`` (the first few kB of a log)."""
+    stamps = [
+        line[1:line.index(b"]")].decode("ascii", errors="replace")
+        for line in head.splitlines()[:-1] or head.splitlines()
+        if line.startswith(b"[") and b"]" in line
+    ]
+    stamps = [t for t in stamps if t[:1].isalnum()][:50]
+    if not stamps:
+        raise ValueError("no bracketed timestamps in the first "
+                         f"{len(head)} bytes of the tank log")
+    for fmt in TIME_FORMATS.values():
+        if pd.to_datetime(pd.Series(stamps), format=fmt,
+                          errors="coerce").notna().all():
+            return fmt
+    raise ValueError(f"unrecognised tank-log timestamp {stamps[0]!r}")
+
+
+def _ctime_as_iso(stamps: pd.Series) -> pd.Series:
+    """Rewrite fixed-width ``Tue Dec 09 18:18:21.776 2025`` stamps as ISO
+    with vectorized slices, so they take pandas' fast ISO parser instead of
+    per-element strptime (several times slower)."""
+    iso = (stamps.str.slice(24, 28) + "-"
+           + stamps.str.slice(4, 7).map(MONTHS) + "-"
+           + stamps.str.slice(8, 23))
+    return iso.where(stamps.str.len() == 28)
+
+
+def parse_tank_lines(data: bytes, time_format: str = TIME_FORMAT) -> pd.DataFrame:
+    """Parse a block of complete log lines into a time-indexed DataFrame.
+
+    Lines that do not yield a valid timestamp and three numbers are dropped.
+    Row order follows the file (the logger occasionally repeats a timestamp;
+    nothing is sorted or de-duplicated here).
+    """
+    raw = pd.read_csv(
+        io.BytesIO(data.translate(_UNBRACKET)),
+        sep=",",
+        header=None,
+        names=["time", *COLUMNS],
+        dtype={"time": str},
+        skipinitialspace=True,
+        skip_blank_lines=True,
+        on_bad_lines="skip",
+        engine="c",
+    )
+    stamps = raw["time"]
+    if time_format == TIME_FORMATS["ctime"]:
+        stamps, time_format = _ctime_as_iso(stamps), TIME_FORMAT
+    times = pd.to_datetime(stamps, format=time_format, errors="coerce")
+    # columns only come back as strings if some field is not a number (and
+    # stay object dtype when no row of the block has numbers at all)
+    df = raw[list(COLUMNS)].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+    df.index = pd.DatetimeIndex(times, name="time")
+    ok = ~np.isnat(df.index.to_numpy()) & df.notna().all(axis=1).to_numpy()
+    return df[ok]
+
+
+def load_tank_ct(
+    path: str | Path | list[str | Path], time_format: str | None = None
+) -> pd.DataFrame:
+    """Parse a whole GPCTD tank log, or several (concatenated in order, e.g.
+    the per-day logs of one tank test).
+
+    The timestamp format is sniffed from the start of each file unless
+    ``time_format`` is given.
+
+    Returns
+    -------
+    DataFrame indexed by ``time`` with ``p_dbar``, ``T_C`` and ``C_Sm``.
+    """
+    if not isinstance(path, (str, Path)):
+        return pd.concat([load_tank_ct(p, time_format) for p in path])
+    data = Path(path).read_bytes()
+    fmt = time_format or sniff_time_format(data[:SNIFF_BYTES])
+    return parse_tank_lines(data, fmt)
+
+
+def iter_tank_ct(
+    path: str | Path,
+    chunk_bytes: int = CHUNK_BYTES,
+    time_format: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield a long tank log as DataFrames of roughly ``chunk_bytes`` each.
+
+    Chunks are cut at line ends, so concatenating the pieces gives the same
+    frame as ``load_tank_ct``.
+    """
+    tail = b""
+    with Path(path).open("rb") as f:
+        fmt = time_format or sniff_time_format(f.read(SNIFF_BYTES))
+        f.seek(0)
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            if cut == 0:
+                tail = block
+                continue
+            tail = block[cut:]
+            yield parse_tank_lines(block[:cut], fmt)
+    if tail.strip():
+        yield parse_tank_lines(tail, fmt)
+
+
+class TankBuffer:
+    """Bounded, time-indexed store of the most recent tank samples.
+
+    Holds at most ``maxlen`` samples (default one day at 1 Hz); older samples
+    are dropped as new ones arrive.  Storage is a pair of preallocated arrays
+    twice that size that are compacted when full, so appending is amortised
+    O(batch) and queries are binary searches on the time array.  Samples are
+    assumed to arrive in time order, as the logger writes them.
+    """
+
+    def __init__(self, maxlen: int = 86400):
+        self.maxlen = maxlen
+        self._times = np.empty(2 * maxlen, dtype="datetime64[us]")
+        self._values = np.empty((2 * maxlen, len(COLUMNS)))
+        self._lo = 0
+        self._hi = 0
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """Append parsed samples (a ``parse_tank_lines`` frame)."""
+        times = df.index.to_numpy().astype("datetime64[us]")[-self.maxlen:]
+        values = df[list(COLUMNS)].to_numpy()[-self.maxlen:]
+        n = len(times)
+        if self._hi + n > len(self._times):
+            keep = min(len(self), self.maxlen - n)
+            lo = self._hi - keep
+            self._times[:keep] = self._times[lo:self._hi]
+            self._values[:keep] = self._values[lo:self._hi]
+            self._lo, self._hi = 0, keep
+        self._times[self._hi:self._hi + n] = times
+        self._values[self._hi:self._hi + n] = values
+        self._hi += n
+        self._lo = max(self._lo, self._hi - self.maxlen)
+
+    def frame(self, t0=None, t1=None) -> pd.DataFrame:
+        """Samples with ``t0 <= time <= t1`` (either end open if None)."""
+        times = self._times[self._lo:self._hi]
+        a = 0 if t0 is None else np.searchsorted(
+            times, pd.Timestamp(t0).to_datetime64(), side="left")
+        b = len(times) if t1 is None else np.searchsorted(
+            times, pd.Timestamp(t1).to_datetime64(), side="right")
+        return pd.DataFrame(
+            self._values[self._lo + a:self._lo + b].copy(),
+            columns=list(COLUMNS),
+            index=pd.DatetimeIndex(times[a:b].copy(), name="time"),
+        )
+
+    def latest(self) -> pd.Series | None:
+        """The newest sample, or None while the buffer is empty."""
+        if not len(self):
+            return None
+        i = self._hi - 1
+        return pd.Series(self._values[i], index=list(COLUMNS),
+                         name=pd.Timestamp(self._times[i]))
+
+    def nearest(self, times, tolerance="3s") -> pd.DataFrame:
+        """Samples nearest to each of ``times`` (NaN beyond ``tolerance``)."""
+        times = pd.DatetimeIndex(times)
+        if not len(self):
+            return pd.DataFrame(np.nan, index=times, columns=list(COLUMNS))
+        buf = self.frame()
+        buf = buf[~buf.index.duplicated(keep="last")]
+        return buf.reindex(times, method="nearest",
+                           tolerance=pd.Timedelta(tolerance))
+
+
+async def follow_tank_log(
+    path: str | Path,
+    buffer: TankBuffer,
+    poll: float = 1.0,
+    stop: asyncio.Event | None = None,
+    time_format: str | None = None,
+) -> None:
+    """Tail a growing tank log into ``buffer`` until ``stop`` is set.
+
+    Every ``poll`` seconds only the bytes appended since the last read are
+    read (at most ``CHUNK_BYTES`` per step) and their complete lines parsed
+    as one batch; a partial last line waits for the next poll.  The file is
+    read from the start if it shrinks (logger restarted).  Reads run in a
+    worker thread so the event loop stays responsive.
+    """
+    path = Path(path)
+    stop = stop or asyncio.Event()
+    offset = 0
+    tail = b""
+    fmt = time_format
+
+    def read_from(start: int) -> bytes:
+        with path.open("rb") as f:
+            f.seek(start)
+            return f.read(CHUNK_BYTES)
+
+    while not stop.is_set():
+        size = path.stat().st_size if path.exists() else 0
+        if size < offset:
+            offset, tail = 0, b""
+        if size > offset:
+            block = await asyncio.get_running_loop().run_in_executor(
+                None, read_from, offset)
+            offset += len(block)
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            tail = block[cut:]
+            if cut:
+                if fmt is None:
+                    try:
+                        fmt = sniff_time_format(block[:cut])
+                    except ValueError:
+                        fmt = None  # no timestamped line yet
+                if fmt is not None:
+                    buffer.extend(parse_tank_lines(block[:cut], fmt))
+            if offset < size:
+                continue  # more backlog to catch up on
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=poll)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,126 @@
+"""Tests for aligning instruments onto a target clock."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from align import align, clock_offset, xcorr_lag
+
+
+T0 = pd.Timestamp("2026-05-28 13:00")
+
+
+def seconds(*s) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex([T0 + pd.Timedelta(seconds=x) for x in s])
+
+
+@pytest.fixture
+def source() -> pd.Series:
+    """Samples every 10 s with value = time / 10 s."""
+    return pd.Series([0.0, 1.0, 2.0, 3.0], index=seconds(0, 10, 20, 30))
+
+
+TARGET = seconds(4, 6, 24, 45)
+
+
+@pytest.mark.parametrize("method, tolerance, expected", [
+    ("nearest", "5s", [0.0, 1.0, 2.0, np.nan]),
+    ("nearest", "20s", [0.0, 1.0, 2.0, 3.0]),
+    ("linear", "10s", [0.4, 0.6, 2.4, np.nan]),
+    # both neighbours must be within tolerance
+    ("linear", "5s", [np.nan, np.nan, np.nan, np.nan]),
+])
+def test_point_methods(source, method, tolerance, expected):
+    out = align(TARGET, {"s": source}, tolerance=tolerance, method=method)
+    assert list(out.columns) == ["s"]
+    assert out.index.equals(TARGET)
+    np.testing.assert_allclose(out["s"], expected)
+
+
+def test_mean(source):
+    # [t - 10 s, t + 10 s) around each target time
+    out = align(TARGET, {"s": source}, method="mean", window="20s")
+    np.testing.assert_allclose(out["s"], [0.5, 0.5, 2.5, np.nan])
+
+
+def test_frame_sources_and_method_mapping(source):
+    frame = pd.DataFrame({"a": source, "b": -source})
+    out = align(TARGET, {"x": frame, "y": source},
+                method={"x": "linear"}, tolerance="10s")
+    assert list(out.columns) == ["x_a", "x_b", "y"]
+    np.testing.assert_allclose(out["x_a"], [0.4, 0.6, 2.4, np.nan])
+    np.testing.assert_allclose(out["x_b"], -out["x_a"])
+    np.testing.assert_allclose(out["y"], [0.0, 1.0, 2.0, np.nan])
+    with pytest.raises(ValueError):
+        align(TARGET, {"x": frame}, method="cubic")
+
+
+@pytest.mark.parametrize("method", ["nearest", "linear", "mean"])
+def test_unsorted_target(method):
+    rng = np.random.default_rng(0)
+    src = pd.Series(rng.normal(size=600),
+                    index=T0 + pd.to_timedelta(np.arange(600) * 3, unit="s"))
+    target = T0 + pd.to_timedelta(np.arange(0, 1800, 60), unit="s")
+    sorted_out = align(target, {"s": src}, method=method, window="60s")
+    order = rng.permutation(len(target))
+    out = align(target[order], {"s": src}, method=method, window="60s")
+    assert out.index.equals(target[order])
+    np.testing.assert_array_equal(out["s"], sorted_out["s"].to_numpy()[order])
+
+
+def test_unsorted_source(source):
+    shuffled = source.iloc[[2, 0, 3, 1]]
+    out = align(TARGET, {"s": shuffled}, method="linear", tolerance="10s")
+    np.testing.assert_allclose(out["s"], [0.4, 0.6, 2.4, np.nan])
+
+
+@pytest.mark.parametrize("lag", [0, 7, -25, 40])
+def test_xcorr_lag_integer_shift(lag):
+    # b[i + lag] = a[i]: large lags must not be pulled towards 0
+    e = np.random.default_rng(0).normal(size=240)
+    a = e[40:]
+    b = np.roll(e, lag)[40:]
+    got, corr = xcorr_lag(a, b, max_lag=60)
+    assert abs(got - lag) < 0.05
+    assert corr == pytest.approx(1.0)
+
+
+def test_xcorr_lag_gaps_and_flat():
+    e = np.random.default_rng(1).normal(size=200)
+    a, b = e[10:], e[:-10].copy()  # b[i + 10] = a[i]
+    b[50:80] = np.nan
+    got, corr = xcorr_lag(a, b, max_lag=30)
+    assert abs(got - 10) < 0.05 and corr == pytest.approx(1.0)
+    assert np.isnan(xcorr_lag(a, np.ones_like(a))).all()
+
+
+def hours(h, step="1s") -> pd.DatetimeIndex:
+    return pd.date_range(T0, T0 + pd.Timedelta(hours=h), freq=step,
+                         inclusive="left")
+
+
+@pytest.mark.parametrize("shift", [30, -120, 95])
+def test_clock_offset_sine(shift):
+    # 1-minute blocks of a 6-hourly sine in 2-hour windows, where the
+    # correlation is broad; half-minute shifts included
+    t = hours(12)
+    x = np.sin(2 * np.pi * np.arange(len(t)) / (6 * 3600))
+    ref = pd.Series(x, index=t)
+    late = pd.Series(x, index=t + pd.Timedelta(seconds=shift))
+    est = clock_offset(ref, late, step="1min", window="2h", max_lag="20min")
+    assert abs(est.offset - shift) < 6  # a tenth of a step
+    assert abs(est.drift) < 1e-5
+    np.testing.assert_allclose(est.lags, shift, atol=6)
+
+
+def test_clock_offset_random_walk():
+    t = hours(6, "3s")
+    walk = np.random.default_rng(2).normal(size=len(t)).cumsum()
+    ref = pd.Series(walk, index=t)
+    late = pd.Series(walk, index=t + pd.Timedelta(seconds=30))
+    est = clock_offset(ref, late, step="3s", window="1h", max_lag="5min")
+    assert abs(est.offset - 30) < 0.3
+    aligned = align(t, {"s": late}, tolerance="1s",
+                    offsets={"s": est})["s"]
+    np.testing.assert_allclose(aligned, walk, atol=1e-12)
@@ -0,0 +1,366 @@
+"""Tests for the vectorized WXT520-SD decoder.
+
+The decoder is checked against ``reference_decode``, a record-by-record
+``struct`` loop in the style of the original port of get_sd_wxt520.m, on a
+slice of a real card image (which already holds one record with a bad CRC
+marker) and on copies of it with damage written in.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from decode_wxt520_sd import (
+    B_SCALARS, REC_SIZE, S_FLAGS, decode_wxt520, decode_wxt520_many,
+    follow_wxt520, load_samples, load_wxt, wind_sample_series, write_outputs,
+)
+
+
+REPO = Path(__file__).resolve().parents[1]
+DAT = REPO / "data/20260520Lab/WXT/ASWXT102.DAT"
+N_RECORDS = 120
+WIND = ("wnde", "wndn", "wspd", "wdir", "compass")
+
+
+def reference_decode(path: Path) -> pd.DataFrame:
+    """Decode one record at a time on the fixed 272-byte stride from the
+    first CRC marker, skipping records with a bad marker or time, then sort
+    and drop duplicate / backwards times."""
+    buf = Path(path).read_bytes()
+    start = max(buf.find(b"\xa5\xa5") + 2 - REC_SIZE, 0)
+    rows = []
+    for a in range(start, len(buf) - REC_SIZE + 1, REC_SIZE):
+        rec = buf[a:a + REC_SIZE]
+        if rec[270:272] != b"\xa5\xa5":
+            continue
+        sec, mn, hr, _unused, day, month = struct.unpack_from("<6B", rec, 0)
+        (year,) = struct.unpack_from("<H", rec, 6)
+        try:
+            ts = datetime(year, month, day, hr, mn, sec)
+        except ValueError:
+            continue
+        B = np.frombuffer(rec, dtype="<f4", count=48, offset=16)
+        S = np.frombuffer(rec, dtype=np.uint8, count=64, offset=208)
+        row = {"time": ts}
+        row.update({name: float(B[i]) for name, i in B_SCALARS.items()})
+        row.update({name: int(S[i]) for name, i in S_FLAGS.items()})
+
+        wdir11 = B[0:11].astype(float)
+        wspd11 = B[11:22].astype(float)
+        compass11 = B[24:35].astype(float)
+        ok = wspd11 < 999.0
+        if ok.any():
+            theta = np.deg2rad(np.mod(wdir11 + compass11, 360.0)[ok])
+            wnde = float(np.mean(wspd11[ok] * np.sin(theta)))
+            wndn = float(np.mean(wspd11[ok] * np.cos(theta)))
+            wspd = float(np.hypot(wnde, wndn))
+            wdir = float(np.mod(np.rad2deg(np.arctan2(wnde, wndn)), 360.0))
+        else:
+            wnde = wndn = wspd = wdir = np.nan
+        cmp_rad = np.deg2rad(compass11)
+        compass = float(np.mod(np.rad2deg(np.arctan2(
+            np.mean(np.sin(cmp_rad)), np.mean(np.cos(cmp_rad)))), 360.0))
+        row.update(wnde=wnde, wndn=wndn, wspd=wspd, wdir=wdir, compass=compass,
+                   wdir11=B[0:11].copy(), wspd11=B[11:22].copy(),
+                   compass11=B[24:35].copy())
+        rows.append(row)
+
+    df = pd.DataFrame(rows).sort_values("time", kind="stable")
+    df = df.drop_duplicates(subset="time")
+    keep = np.r_[True, np.diff(df["time"].to_numpy()) > np.timedelta64(0, "s")]
+    return df.loc[keep].set_index("time")
+
+
+def assert_matches(path: Path, ref: pd.DataFrame | None = None):
+    """Decode ``path`` and compare every column and the sample arrays with
+    ``reference_decode`` (of ``path`` unless ``ref`` is given)."""
+    ref = reference_decode(path) if ref is None else ref
+    df, samples, meta = decode_wxt520(path)
+    np.testing.assert_array_equal(df.index.to_numpy(),
+                                  ref.index.to_numpy().astype(df.index.dtype))
+    for col in [*B_SCALARS, *S_FLAGS]:
+        np.testing.assert_array_equal(df[col].to_numpy(), ref[col].to_numpy(),
+                                      err_msg=col)
+    for col in WIND:
+        np.testing.assert_allclose(df[col].to_numpy(), ref[col].to_numpy(),
+                                   rtol=1e-12, atol=1e-9, err_msg=col)
+    for col in ("wdir11", "wspd11", "compass11"):
+        np.testing.assert_array_equal(getattr(samples, col),
+                                      np.vstack(ref[col].to_numpy()), err_msg=col)
+    return df, samples, meta
+
+
+def record_starts(raw: bytes) -> int:
+    return raw.find(b"\xa5\xa5") + 2 - REC_SIZE
+
+
+def record_time(raw: bytes, r: int) -> np.datetime64:
+    """Time of record ``r`` of a slice starting on a record."""
+    sec, mn, hr, _unused, day, month = struct.unpack_from("<6B", raw, r * REC_SIZE)
+    (year,) = struct.unpack_from("<H", raw, r * REC_SIZE + 6)
+    return np.datetime64(datetime(year, month, day, hr, mn, sec), "us")
+
+
+def write_floats(data: bytearray, r: int, i: int, values) -> None:
+    """Overwrite ``B[i:i + len(values)]`` of record ``r``."""
+    struct.pack_into(f"<{len(values)}f", data, r * REC_SIZE + 16 + 4 * i,
+                     *values)
+
+
+@pytest.fixture
+def raw() -> bytes:
+    """The first ``N_RECORDS`` records of a real card image."""
+    if not DAT.exists():
+        pytest.skip(f"{DAT} not available")
+    data = DAT.read_bytes()
+    first = record_starts(data)
+    return data[first:first + N_RECORDS * REC_SIZE]
+
+
+@pytest.fixture
+def dat(tmp_path, raw) -> Path:
+    path = tmp_path / "ASWXT102.DAT"
+    path.write_bytes(raw)
+    return path
+
+
+def test_matches_reference(dat):
+    df, _, meta = assert_matches(dat)
+    # the slice holds one record with a bad CRC marker
+    assert meta["bad_crc"] == 1
+    assert meta["nrecs_decoded"] == len(df) == N_RECORDS - 1
+
+
+def test_corrupted_marker(tmp_path, raw):
+    data = bytearray(raw)
+    data[20 * REC_SIZE + 271] = 0x00  # break record 20's CRC marker
+    path = tmp_path / "bad_marker.DAT"
+    path.write_bytes(bytes(data))
+    df, _, meta = assert_matches(path)
+    assert meta["bad_crc"] == 2
+    assert len(df) == N_RECORDS - 2
+
+
+def test_dropped_byte_resyncs(tmp_path, raw):
+    # one byte lost inside record 50: the fixed-stride reference would lose
+    # every later record, the decoder only loses record 50
+    cut = 50 * REC_SIZE + 100
+    path = tmp_path / "dropped.DAT"
+    path.write_bytes(raw[:cut] + raw[cut + 1:])
+    without = tmp_path / "without_50.DAT"
+    without.write_bytes(raw[:50 * REC_SIZE] + raw[51 * REC_SIZE:])
+    df, _, meta = assert_matches(path, reference_decode(without))
+    # the slice's own bad record, then the short one
+    assert [r["skipped_bytes"] for r in meta["resync"]] == [REC_SIZE, REC_SIZE - 1]
+
+
+def test_spurious_marker_is_not_a_resync(tmp_path, raw):
+    # a marker and size field that happen to occur inside records 30 / 31
+    # make a candidate off the stride; it must not count as a resync
+    data = bytearray(raw)
+    fake = 30 * REC_SIZE + 100
+    data[fake + 14:fake + 16] = REC_SIZE.to_bytes(2, "little")
+    data[fake + REC_SIZE - 2:fake + REC_SIZE] = b"\xa5\xa5"
+    path = tmp_path / "spurious.DAT"
+    path.write_bytes(bytes(data))
+    df, _, meta = assert_matches(path)
+    assert [r["skipped_bytes"] for r in meta["resync"]] == [REC_SIZE]
+    assert meta["bad_crc"] == 1
+    assert len(df) == N_RECORDS - 1
+
+
+def test_time_window(dat):
+    full, full_samples, _ = decode_wxt520(dat)
+    tstart, tend = full.index[10], full.index[40]
+    df, samples, _ = decode_wxt520(dat, tstart, tend)
+    pd.testing.assert_frame_equal(df, full.loc[tstart:tend])
+    np.testing.assert_array_equal(samples.wspd11, full_samples.wspd11[10:41])
+
+
+def test_offset_with_file_list(dat):
+    with pytest.raises(ValueError):
+        decode_wxt520([dat, dat], offset=REC_SIZE)
+
+
+def test_follow_appends_sample_parts(tmp_path, dat, raw):
+    _, full_samples, _ = decode_wxt520(dat)
+    card = tmp_path / "card" / "ASWXT102.DAT"
+    card.parent.mkdir()
+    out = tmp_path / "out"
+    for n in (40, 90, N_RECORDS):
+        card.write_bytes(raw[:n * REC_SIZE])
+        follow_wxt520(card, out)
+    # the first write is left alone; each refresh adds one part file
+    assert sorted(p.name for p in out.glob("*.npz")) == [
+        "ASWXT102_samples.00001.npz", "ASWXT102_samples.00002.npz",
+        "ASWXT102_samples.npz"]
+    with np.load(out / "ASWXT102_samples.npz") as z:
+        assert len(z["time"]) == 39  # record 7 is the bad one
+    smp = load_samples(out / "ASWXT102")
+    for a, b in zip(smp, full_samples):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_load_wxt_parquet_matches_csv(tmp_path, dat):
+    pytest.importorskip("pyarrow")
+    df, samples, meta = decode_wxt520(dat)
+    write_outputs(df, samples, meta, tmp_path, "ASWXT102")
+    csv_path = tmp_path / "ASWXT102.csv"
+    tstart, tend = df.index[5], df.index[60]
+    from_pq, pq_samples = load_wxt(csv_path, tstart, tend, samples=True)
+    # a CSV newer than the Parquet dataset is read instead
+    st = csv_path.stat()
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    from_csv, csv_samples = load_wxt(csv_path, tstart, tend, samples=True)
+
+    assert (from_pq.dtypes == from_csv.dtypes).all()
+    assert (from_pq.dtypes == df.dtypes).all()
+    pd.testing.assert_frame_equal(from_pq, from_csv, check_index_type=False,
+                                  check_freq=False)
+    pd.testing.assert_frame_equal(from_pq, df.loc[tstart:tend],
+                                  check_index_type=False, check_freq=False)
+    for a, b in zip(pq_samples[1:], csv_samples[1:]):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_follow_appends_parquet_parts(tmp_path, dat, raw):
+    pytest.importorskip("pyarrow")
+    full, _, _ = decode_wxt520(dat)
+    card = tmp_path / "card" / "ASWXT102.DAT"
+    card.parent.mkdir()
+    out = tmp_path / "out"
+    for n in (40, 90, N_RECORDS):
+        card.write_bytes(raw[:n * REC_SIZE])
+        follow_wxt520(card, out)
+    parts = sorted(p.name for p in (out / "ASWXT102.parquet").iterdir())
+    assert parts == [f"part-0000{i}.parquet" for i in range(3)]
+    df = load_wxt(out / "ASWXT102.parquet")
+    pd.testing.assert_frame_equal(df, full, check_index_type=False,
+                                  check_freq=False)
+
+
+def test_follow_steps_past_bad_times(tmp_path, raw):
+    data = bytearray(raw)
+    for r in range(40, 50):
+        data[r * REC_SIZE + 5] = 13  # month 13
+    card = tmp_path / "ASWXT102.DAT"
+    out = tmp_path / "out"
+    card.write_bytes(bytes(data[:40 * REC_SIZE]))
+    assert follow_wxt520(card, out) is not None
+    card.write_bytes(bytes(data[:50 * REC_SIZE]))
+    assert follow_wxt520(card, out) is None
+    ckpt = json.loads((out / "ASWXT102_checkpoint.json").read_text())
+    assert ckpt["offset"] == 50 * REC_SIZE
+    card.write_bytes(bytes(data[:60 * REC_SIZE]))
+    df, _, meta = follow_wxt520(card, out)
+    assert len(df) == 10 and meta["bad_time"] == 0
+
+
+def test_qc_columns(tmp_path, raw):
+    # the PTU is off on this card: give every record readings, then zero a
+    # few, and write speed sentinels into others
+    data = bytearray(raw)
+    atmp = B_SCALARS["atmp"]
+    assert [B_SCALARS[c] - atmp for c in ("hrh", "bpr")] == [1, 2]
+    for r in range(N_RECORDS):
+        write_floats(data, r, atmp, [20.5, 55.0, 1013.2])
+    ptu_zero, all_bad, some_bad = [12, 13, 90], [30, 101], [31, 60]
+    for r in ptu_zero:
+        write_floats(data, r, atmp, [0.0, 0.0, 0.0])
+    for r in all_bad:
+        write_floats(data, r, 11, [999.9] * 11)
+    for r in some_bad:
+        write_floats(data, r, 13, [999.9] * 3)
+    path = tmp_path / "qc.DAT"
+    path.write_bytes(bytes(data))
+    df, _, _ = decode_wxt520(path)
+
+    def rows(records):
+        return df.index.isin([record_time(raw, r) for r in records])
+
+    np.testing.assert_array_equal(df["qc_ptu_zero"], rows(ptu_zero))
+    np.testing.assert_array_equal(df["qc_wind_bad"], rows(all_bad))
+    expected_nbad = np.where(rows(all_bad), 11, np.where(rows(some_bad), 3, 0))
+    np.testing.assert_array_equal(df["qc_wind_nbad"], expected_nbad)
+    assert df["qc_wind_nbad"].dtype == np.uint8
+    assert df.loc[df["qc_wind_bad"], "wspd"].isna().all()
+    assert df.loc[~df["qc_wind_bad"], "wspd"].notna().all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_many_merges_overlapping_files(tmp_path, dat, raw, workers):
+    # records 0-69 and 40-119 as two cards; the union is the whole slice
+    first = tmp_path / "first.DAT"
+    first.write_bytes(raw[:70 * REC_SIZE])
+    second = tmp_path / "second.DAT"
+    second.write_bytes(raw[40 * REC_SIZE:])
+    whole, whole_samples, _ = decode_wxt520(dat)
+    df, samples, meta = decode_wxt520_many([second, first], workers=workers)
+
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(df, whole)
+    for a, b in zip(samples, whole_samples):
+        np.testing.assert_array_equal(a, b)
+    assert meta["nrecs_decoded"] == len(whole)
+    assert meta["duplicates"] == 30
+    assert meta["bad_crc"] == 1  # record 7, in the first file only
+    files = meta["files"]
+    assert [f["infile"] for f in files] == [str(second), str(first)]
+    assert [f["nrecs_decoded"] for f in files] == [80, 69]
+    assert [f["bytes"] for f in files] == [80 * REC_SIZE, 70 * REC_SIZE]
+    assert all(f["seconds"] >= 0 for f in files)
+
+
+def test_sample_times_and_series(tmp_path, raw):
+    data = bytearray(raw)
+    write_floats(data, 30, 11, [999.9] * 11)
+    write_floats(data, 31, 13, [999.9] * 3)
+    path = tmp_path / "samples.DAT"
+    path.write_bytes(bytes(data))
+    df, samples, _ = decode_wxt520(path)
+
+    times = samples.sample_times()
+    assert times.shape == samples.wspd11.shape
+    assert (np.diff(times, axis=1) == np.timedelta64(5, "s")).all()
+    np.testing.assert_array_equal(times[:, -1], df.index.to_numpy())
+
+    series = wind_sample_series(samples)
+    assert len(series) == 11 * len(df)
+    np.testing.assert_array_equal(series.index.to_numpy(), times.ravel())
+    for col in ("wnde", "wndn"):
+        per_record = series[col].to_numpy().reshape(-1, 11)
+        with np.errstate(invalid="ignore"), pytest.warns(RuntimeWarning):
+            mean = np.nanmean(per_record, axis=1)
+        np.testing.assert_allclose(mean, df[col], rtol=1e-12, atol=1e-12,
+                                   err_msg=col)
+    assert series.loc[series["wspd"] >= 999.0, "wnde"].isna().all()
+
+
+def test_serial_ranges(tmp_path, raw):
+    # module S/N (S[36:40]) swapped from record 80 on, blank in records 50-54
+    data = bytearray(raw)
+    modser = slice(208 + 36, 208 + 40)
+    assert bytes(data[modser]).rstrip(b"\x00") == b"102"
+    for r in range(50, 55):
+        data[r * REC_SIZE + modser.start:r * REC_SIZE + modser.stop] = bytes(4)
+    for r in range(80, N_RECORDS):
+        data[r * REC_SIZE + modser.start:r * REC_SIZE + modser.stop] = b"204\x00"
+    path = tmp_path / "serials.DAT"
+    path.write_bytes(bytes(data))
+    df, _, meta = decode_wxt520(path)
+
+    def iso(r):
+        return pd.Timestamp(record_time(raw, r)).isoformat()
+
+    assert meta["serial_ranges"]["module_sn"] == [
+        {"value": "102", "time_start": iso(0), "time_end": iso(79)},
+        {"value": "204", "time_start": iso(80), "time_end": iso(N_RECORDS - 1)},
+    ]
+    assert meta["module_sn"] == "102"  # 74 records against 40
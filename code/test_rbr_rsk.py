@@ -0,0 +1,105 @@
+"""Tests for the ``RSK`` facade against ``read_rbr_rsk`` on a tiny synthetic
+.rsk (SQLite) file."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rbr_rsk import RSK, read_rbr_rsk
+
+
+T0_MS = 1780059600000  # 2026-05-29 13:00:00
+N_SAMPLES = 40
+
+
+@pytest.fixture
+def rsk_path(tmp_path) -> Path:
+    """Two temperature channels at 1 Hz, the rows stored out of order."""
+    path = tmp_path / "233860_tiny.rsk"
+    rng = np.random.default_rng(0)
+    rows = [(T0_MS + 1000 * i, 20 + rng.normal(), 18 + rng.normal())
+            for i in range(N_SAMPLES)]
+    rows = [rows[i] for i in rng.permutation(N_SAMPLES)]
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            create table data (tstamp bigint primary key, channel01 double,
+                               channel02 double);
+            create table channels (channelID integer primary key,
+                                   longNamePlainText text,
+                                   unitsPlainText text);
+            create table instrumentChannels (instrumentID integer,
+                                             channelID integer,
+                                             channelOrder integer);
+            create table parameters (parameterID integer primary key,
+                                     tstamp bigint);
+            create table parameterKeys (parameterID integer, key text,
+                                        value text);
+            create table instruments (instrumentID integer primary key,
+                                      serialID integer, model text,
+                                      firmwareVersion text,
+                                      firmwareType integer);
+            create table deployments (deploymentID integer primary key,
+                                      timeOfDownload bigint, name text);
+            create table appSettings (deploymentID integer primary key,
+                                      ruskinVersion text);
+            create table dbInfo (version text);
+            insert into channels values (1, 'Temperature', '°C'),
+                                        (2, 'Temperature', '°C');
+            insert into instrumentChannels values (1, 1, 1), (1, 2, 2);
+            insert into parameters values (1, 0);
+            insert into parameterKeys values (1, 'ATMOSPHERE', '10.1325');
+            insert into instruments values (1, 233860, 'RBRduo³', '1.116', 104);
+            insert into deployments values (1, 1780063200000, 'tiny.rsk');
+            insert into appSettings values (1, '2.20.0');
+            insert into dbInfo values ('2.19.0');
+        """)
+        conn.executemany("insert into data values (?, ?, ?)", rows)
+    return path
+
+
+def test_readdata_matches_read_rbr_rsk(rsk_path):
+    ds = read_rbr_rsk(rsk_path)
+    with RSK(rsk_path) as rsk:
+        assert rsk.channelNames == ["temperature", "temperature1"]
+        assert rsk.channelUnits == ["°C", "°C"]
+        rsk.readdata()
+        data = rsk.data
+        epoch = rsk.epoch
+    assert data.dtype.names == ("timestamp", "temperature", "temperature1")
+    assert len(data) == N_SAMPLES
+    np.testing.assert_array_equal(data["timestamp"],
+                                  ds["time"].to_numpy().astype("datetime64[ms]"))
+    for name in ("temperature", "temperature1"):
+        np.testing.assert_array_equal(data[name], ds[name].to_numpy())
+    assert epoch.startTime == data["timestamp"][0]
+    assert epoch.endTime == data["timestamp"][-1]
+
+
+def test_readdata_window(rsk_path):
+    ds = read_rbr_rsk(rsk_path)
+    t1 = pd.Timestamp(T0_MS, unit="ms") + pd.Timedelta(seconds=5)
+    t2 = t1 + pd.Timedelta(seconds=10)
+    with RSK(rsk_path) as rsk:
+        rsk.readdata(t1, t2)
+        window = rsk.data
+        rsk.readdata(t2=t1)
+        head = rsk.data
+    expected = ds.sel(time=slice(t1, t2))
+    assert len(window) == 11
+    np.testing.assert_array_equal(
+        window["timestamp"], expected["time"].to_numpy().astype("datetime64[ms]"))
+    np.testing.assert_array_equal(window["temperature"],
+                                  expected["temperature"].to_numpy())
+    assert len(head) == 6
+
+
+def test_not_open(rsk_path, tmp_path):
+    rsk = RSK(rsk_path)
+    with pytest.raises(RuntimeError):
+        rsk.readdata()
+    with pytest.raises(FileNotFoundError):
+        RSK(tmp_path / "missing.rsk").open()
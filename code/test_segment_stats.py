@@ -0,0 +1,143 @@
+"""Tests for the segment / window / block statistics against plain pandas."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from segment_stats import block_average, segment_ids, segment_stats, window_stats
+from shs_notes import Interval
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """Two days of 10-s samples of three variables, with NaN gaps."""
+    rng = np.random.default_rng(0)
+    n = 2 * 8640
+    index = pd.date_range("2026-05-28", periods=n, freq="10s", name="time")
+    df = pd.DataFrame({
+        "T": 20 + rng.normal(0, 1, n).cumsum() * 0.01,
+        "RH": rng.uniform(40, 90, n),
+        "p": 1013 + rng.normal(0, 0.5, n),
+    }, index=index)
+    df.iloc[rng.choice(n, n // 20, replace=False), 0] = np.nan
+    df.iloc[100:400, 1] = np.nan
+    return df
+
+
+def pandas_stats(df: pd.DataFrame, key) -> pd.DataFrame:
+    g = df.groupby(key)
+    stats = pd.concat({
+        "count": g.count(),
+        "mean": g.mean(),
+        "std": g.std(ddof=0),
+        "min": g.min(),
+        "max": g.max(),
+    }, axis=1)
+    return stats.stack(level=1, future_stack=True)
+
+
+def test_segment_ids(frame):
+    edges = pd.to_datetime(["2026-05-28 06:00", "2026-05-28 12:00",
+                            "2026-05-29 00:00"])
+    seg = segment_ids(frame.index, edges)
+    expected = np.searchsorted(edges.to_numpy(), frame.index.to_numpy(),
+                               side="right") - 1
+    np.testing.assert_array_equal(seg, expected)
+    assert seg[0] == -1 and seg[-1] == len(edges) - 1
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_segment_stats_matches_groupby(frame, shuffle):
+    edges = frame.index[[500, 2000, 2001, 9000, 15000]]
+    seg = segment_ids(frame.index, edges)
+    df = frame
+    if shuffle:
+        order = np.random.default_rng(1).permutation(len(frame))
+        df, seg = frame.iloc[order], seg[order]
+    got = segment_stats(seg, df).set_index(["segment", "variable"])
+    expected = pandas_stats(df, seg)
+    assert list(got.index) == list(expected.index)
+    sizes = pd.Series(seg).value_counts().sort_index()
+    np.testing.assert_array_equal(got["length"].xs("T", level="variable"),
+                                  sizes)
+    for stat in ("count", "mean", "std", "min", "max"):
+        np.testing.assert_allclose(got[stat].to_numpy(float),
+                                   expected[stat].to_numpy(float),
+                                   rtol=1e-9, atol=1e-9, err_msg=stat)
+
+
+def test_segment_stats_inputs(frame):
+    seg = np.repeat([0, 1, 2, 3], len(frame) // 4)
+    from_frame = segment_stats(seg, frame)
+    from_mapping = segment_stats(seg, {c: frame[c].to_numpy() for c in frame})
+    pd.testing.assert_frame_equal(from_frame, from_mapping)
+    from_array = segment_stats(seg, frame.to_numpy())
+    assert list(from_array["variable"][:3]) == ["x0", "x1", "x2"]
+    np.testing.assert_array_equal(from_array["mean"], from_frame["mean"])
+    with pytest.raises(ValueError):
+        segment_stats(seg[:-1], frame)
+
+
+def test_window_stats_matches_masks(frame):
+    t = pd.Timestamp
+    windows = [
+        (None, None, "all"),
+        (t("2026-05-28 01:00"), t("2026-05-28 03:00"), "a"),
+        (t("2026-05-28 02:00"), t("2026-05-28 02:30"), "overlaps a"),
+        # pooled with the first "a"
+        Interval(t("2026-05-29 10:00"), t("2026-05-29 10:05"), "air", "a"),
+        (t("2026-05-29 20:00"), None, "open end"),
+        (t("2026-06-02"), t("2026-06-03"), "empty"),
+    ]
+    got = window_stats(frame, windows, ["T", "RH"])
+    assert list(dict.fromkeys(got["window"])) == [
+        "all", "a", "overlaps a", "open end", "empty"]
+    for label, rows in got.groupby("window", sort=False):
+        mask = np.zeros(len(frame), dtype=bool)
+        for w in windows:
+            if w[-1] != label:
+                continue
+            t0, t1 = w[0], w[1]
+            mask |= ((frame.index >= (t0 or frame.index[0]))
+                     & (frame.index <= (t1 or frame.index[-1])))
+        sub = frame.loc[mask, ["T", "RH"]]
+        rows = rows.set_index("variable")
+        np.testing.assert_array_equal(rows["count"], sub.count())
+        if label == "empty":
+            assert rows["mean"].isna().all()
+            continue
+        np.testing.assert_allclose(rows["mean"], sub.mean(), rtol=1e-12)
+        np.testing.assert_allclose(rows["std"], sub.std(ddof=0), rtol=1e-7)
+        np.testing.assert_allclose(rows["rms"], np.sqrt((sub ** 2).mean()),
+                                   rtol=1e-12)
+
+
+@pytest.mark.parametrize("freq", ["3s", "1min", "7s"])
+def test_block_average_matches_resample(frame, freq):
+    # drop some samples so there are short and empty bins
+    df = frame.iloc[np.r_[0:3000, 3100:9000, 9005:len(frame)]]
+    blocks = block_average(df.index, df, freq)
+    r = df.resample(freq, origin="epoch")
+    expected = {"count": r.count(), "sum": r.sum(), "mean": r.mean(),
+                "std": r.std(ddof=0)}
+    for stat, ref in expected.items():
+        got = blocks.frame(stat)
+        assert got.index.equals(ref.index), stat
+        np.testing.assert_allclose(got.to_numpy(float), ref.to_numpy(float),
+                                   rtol=1e-9, atol=1e-9, err_msg=stat)
+
+
+def test_block_average_sparse_bins():
+    times = pd.to_datetime(["2026-05-28 13:00:01", "2026-05-28 13:00:02",
+                            "2026-05-28 13:00:10", "2026-05-28 13:00:11"])
+    x = pd.Series([1.0, np.nan, 4.0, 6.0], index=times, name="T")
+    filled = block_average(times, x, "3s")
+    assert list(filled.count[:, 0]) == [1, 0, 0, 2]
+    np.testing.assert_allclose(filled.mean[:, 0], [1.0, np.nan, np.nan, 5.0])
+    np.testing.assert_allclose(filled.std[:, 0], [0.0, np.nan, np.nan, 1.0])
+    sparse = block_average(times, x, "3s", fill=False)
+    assert list(pd.DatetimeIndex(sparse.time)) == [
+        pd.Timestamp("2026-05-28 13:00:00"), pd.Timestamp("2026-05-28 13:00:09")]
+    with pytest.raises(ValueError):
+        block_average(times[:-1], x, "3s")
@@ -0,0 +1,74 @@
+"""Tests for the Sentinel Feather cache: it must give the same frame as the
+CSV and be rebuilt when the CSV changes."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sentinel import load_sentinel, read_sentinel_csv
+
+
+REPO = Path(__file__).resolve().parents[1]
+CSV = REPO / "data/Sentinel/WFIP_Sentinel2.csv"
+
+
+@pytest.fixture
+def csv_path(tmp_path) -> Path:
+    """The first 200 records of a Sentinel export."""
+    pytest.importorskip("pyarrow")
+    if not CSV.exists():
+        pytest.skip(f"{CSV} not available")
+    lines = CSV.read_text().splitlines(keepends=True)
+    path = tmp_path / CSV.name
+    path.write_text("".join(lines[:201]))
+    return path
+
+
+def test_cache_matches_csv(csv_path):
+    df = load_sentinel(csv_path)
+    cache = csv_path.with_suffix(".feather")
+    assert cache.exists()
+    expected = read_sentinel_csv(csv_path)
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+    # the stem and the cache name load the same record
+    pd.testing.assert_frame_equal(load_sentinel(csv_path.with_suffix("")), df)
+    pd.testing.assert_frame_equal(load_sentinel(cache), df)
+    t0, t1 = df.index[20], df.index[50]
+    part = load_sentinel(csv_path, t0, t1, columns=["humidity_HC2"])
+    pd.testing.assert_frame_equal(part, expected.loc[t0:t1, ["humidity_HC2"]],
+                                  check_freq=False)
+
+
+def test_cache_rebuilt_after_csv_changes(csv_path):
+    load_sentinel(csv_path)
+    cache = csv_path.with_suffix(".feather")
+    built = cache.stat().st_mtime_ns
+    # a fresh cache is reused
+    load_sentinel(csv_path)
+    assert cache.stat().st_mtime_ns == built
+
+    # same size, new value and modification time
+    text = csv_path.read_text()
+    header, first, rest = text.split("\n", 2)
+    fields = first.split(",")
+    old = fields[2]
+    fields[2] = "1" + old[1:] if old[0] != "1" else "2" + old[1:]
+    csv_path.write_text("\n".join([header, ",".join(fields), rest]))
+    st = csv_path.stat()
+    os.utime(csv_path, ns=(st.st_atime_ns, built + 10**9))
+    df = load_sentinel(csv_path)
+    assert df.iloc[0, 1] == np.float32(fields[2])
+    assert df.iloc[0, 1] != np.float32(old)
+    pd.testing.assert_frame_equal(df, read_sentinel_csv(csv_path),
+                                  check_freq=False)
+
+    # a touch alone also rebuilds
+    rebuilt = cache.stat().st_mtime_ns
+    st = csv_path.stat()
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    load_sentinel(csv_path)
+    assert cache.stat().st_mtime_ns != rebuilt
@@ -0,0 +1,135 @@
+"""Tests for the SHS test-notes parser, on every notes file in data/ and on
+the line formats they use."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shs_notes import all_tests, classify, find_notes, load_notes, parse_notes
+
+
+# test -> (first day, kinds in time order)
+EXPECTED = {
+    "20241118Field": ("2024-11-18", ["dunk"] * 6),
+    "20241120Field": ("2024-11-20", ["start"] + ["dunk"] * 8),
+    "20241216Field": ("2024-12-16", ["start"]),
+    "20250227Lab": ("2025-02-27", ["start", "IN", "OUT", "OFF"]),
+    "20260121Tank": ("2026-01-21", ["start"] + ["IN", "OUT"] * 8 + ["OFF"]),
+    "20260520Lab": ("2026-05-20",
+                    ["start", "IN", "note", "OUT"] + ["IN", "OUT"] * 4 + ["OFF"]),
+    "20260528Lab": ("2026-05-28", ["start"] + ["IN", "OUT"] * 6 + ["OFF"]),
+}
+
+
+def test_every_notes_file_is_covered():
+    assert set(all_tests()) <= set(EXPECTED)
+
+
+@pytest.mark.parametrize("test", sorted(EXPECTED))
+def test_notes_files(test):
+    try:
+        notes = load_notes(test)
+    except FileNotFoundError:
+        pytest.skip(f"no notes for {test}")
+    day, kinds = EXPECTED[test]
+    assert notes.day == day
+    assert list(notes.kinds) == kinds
+    assert (np.diff(notes.times) >= np.timedelta64(0, "s")).all()
+    runs = notes.intervals()
+    assert runs[-1].t1 is None
+    assert all(a.t1 == b.t0 for a, b in zip(runs[:-1], runs[1:]))
+
+
+def test_find_notes_prefers_shs_notes(tmp_path):
+    (tmp_path / "meeting_notes.txt").write_text("agenda\n")
+    shs = tmp_path / "20260528_SHS-test-notes_EGH.txt"
+    shs.write_text("2026-05-28\n13:08z - SHS on\n")
+    assert find_notes(tmp_path) == shs
+    assert find_notes(shs) == shs
+    # two SHS notes files: no guessing
+    (tmp_path / "20260529_SHS-notes_EGH.txt").write_text("2026-05-29\n")
+    with pytest.raises(ValueError):
+        find_notes(tmp_path)
+    # without an SHS notes file, a single other notes file is used
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "notes-email-EGH.txt").write_text("2025-02-27\n")
+    assert find_notes(other).name == "notes-email-EGH.txt"
+    (other / "meeting_notes.txt").write_text("agenda\n")
+    with pytest.raises(ValueError):
+        find_notes(other)
+    with pytest.raises(FileNotFoundError):
+        find_notes(tmp_path / "missing")
+
+
+def test_two_day_notes():
+    notes = load_notes("20260121Tank")
+    assert notes.times[0] == np.datetime64("2026-01-21T16:32:00")
+    assert notes.times[-1] == np.datetime64("2026-01-22T19:36:00")
+    water = notes.intervals("water")
+    assert [iv.label for iv in water] == [f"IN-{i}" for i in range(1, 9)]
+    assert water[1].t0 == pd.Timestamp("2026-01-21 18:48:30")
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("SHS IN tank", "IN"),
+    ("SHS sensor in the water (IN)", "IN"),
+    ("probe submerged in tank", "IN"),
+    ("SHS OUT of tank", "OUT"),
+    ("removed from tank and placed in front of fan", "OUT"),
+    ("out in front of fan - tank logging stopped", "OUT"),
+    ("SHS on, WXT logging, Tank CT logging, fan on", "start"),
+    ("RBR sensor turned on", "start"),
+    ("start unit and begin at sea trial", "start"),
+    ("fan on (note in wxt data)", "note"),
+    ("dunk/wet - but not turned on", "dunk"),
+    ("recovery (dunk on recovery)", "dunk"),
+    ("stop RBR and WXT and recover data", "OFF"),
+    ("OFF ", "OFF"),
+    ("IMG_7344.jpeg - picture wick", "note"),
+])
+def test_classify(text, kind):
+    assert classify(text) == kind
+
+
+def test_line_formats():
+    notes = parse_notes([
+        "Humidity sensor test 20241118\n",
+        "17:17:43 - dunk/wet\n",
+        "•\t1627 sensor turned on\n",
+        "2024/11/19\n",
+        "~09:05z - SHS IN tank\n",
+        "20241120 09:15 - OUT\n",
+        "09:20 - fan on\n",
+    ])
+    assert notes.day == "2024-11-18"
+    assert list(notes.times) == list(np.array([
+        "2024-11-18T16:27", "2024-11-18T17:17:43", "2024-11-19T09:05",
+        "2024-11-20T09:15", "2024-11-20T09:20"], dtype="datetime64[s]"))
+    assert list(notes.kinds) == ["start", "dunk", "IN", "OUT", "note"]
+    assert list(notes.states) == ["air", "air", "water", "air", "air"]
+
+
+def test_no_day_no_events():
+    with pytest.raises(ValueError):
+        parse_notes(["13:11z - SHS IN tank\n"], "undated")
+
+
+def test_state_and_intervals():
+    notes = parse_notes([
+        "2026-05-28\n",
+        "13:08z - SHS on\n",
+        "13:11z - SHS IN tank\n",
+        "13:27z - SHS OUT of tank\n",
+    ])
+    t = pd.to_datetime(["2026-05-28 13:00", "2026-05-28 13:15",
+                        "2026-05-28 13:30"])
+    assert list(notes.state_at(t)) == ["air", "water", "air"]
+    assert list(notes.segment(t)) == [-1, 1, 2]
+    runs = notes.intervals()
+    assert [(iv.label, iv.state) for iv in runs] == [
+        ("air-0", "air"), ("IN-1", "water"), ("air-1", "air")]
+    # the run after the last note is kept, open-ended
+    assert runs[-1] == (pd.Timestamp("2026-05-28 13:27"), None, "air", "air-1")
+    assert notes.intervals("water") == [runs[1]]
@@ -0,0 +1,110 @@
+"""Tests for the GPCTD tank-log reader: chunked reading must give the same
+frame as reading the whole log."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tank_log import (
+    TIME_FORMATS, TankBuffer, follow_tank_log, iter_tank_ct, load_tank_ct,
+    sniff_time_format,
+)
+
+
+REPO = Path(__file__).resolve().parents[1]
+LOGS = [
+    REPO / "data/20251211Tank/20251208_SHS-test_EGH_Tank-Temp/20251209_SHS-test_EGH.txt",
+    REPO / "data/20260528Lab/tank_CT/20260528_tank_CT_log_EGH",
+]
+
+ISO_LOG = (
+    b"<!--start logging-->\r\n"
+    b"[2026-05-28 13:07:29.819]     0.16, 17.6454, 3.91483\r\n"
+    b"\r\n"
+    b"[2026-05-28 13:07:30.319]     0.16, 17.6455, 3.91484\r\n"
+    b"    0.16, 17.6455, 3.91484\r\n"  # no timestamp
+    b"[2026-05-28 13:07:30.319]     0.17, 17.6457, 3.91485\r\n"  # repeated time
+    b"[2026-05-28 13:07:30.819]     0.17, 17.6460\r\n"  # short line
+    b"[2026-05-28 13:07:31.319]     0.16, 17.6461, 3.91487\r\n"
+    b"<!--stop logging-->\r\n"
+    b"[2026-05-28 13:07:31.819]     0.16, 17.6463, 3.91488"  # no final newline
+)
+CTIME_LOG = (
+    b"[Tue Dec 09 18:18:21.776 2025]     0.32, 17.9877, 3.85820\n"
+    b"[Tue Dec 09 18:18:22.276 2025] \n"
+    b"[Tue Dec 09 18:18:22.776 2025]     0.32, 17.9879, 3.85821\n"
+    b"\n"
+    b"[Tue Dec 09 18:18:23.276 2025]     0.33, 17.9880, 3.85821\n"
+)
+
+
+@pytest.mark.parametrize("text, fmt, n", [
+    (ISO_LOG, "iso", 5),
+    (CTIME_LOG, "ctime", 3),
+], ids=["iso", "ctime"])
+def test_synthetic_logs(tmp_path, text, fmt, n):
+    path = tmp_path / "tank.log"
+    path.write_bytes(text)
+    assert sniff_time_format(text) == TIME_FORMATS[fmt]
+    whole = load_tank_ct(path)
+    assert len(whole) == n
+    assert whole.index.is_monotonic_increasing
+    for chunk_bytes in (7, 40, 64, 1 << 20):
+        chunks = pd.concat(list(iter_tank_ct(path, chunk_bytes=chunk_bytes)))
+        pd.testing.assert_frame_equal(chunks, whole)
+
+
+def test_ctime_values(tmp_path):
+    path = tmp_path / "tank.log"
+    path.write_bytes(CTIME_LOG)
+    df = load_tank_ct(path)
+    assert df.index[0] == pd.Timestamp("2025-12-09 18:18:21.776")
+    assert df.iloc[-1].tolist() == [0.33, 17.988, 3.85821]
+
+
+@pytest.mark.parametrize("path", LOGS, ids=lambda p: p.name)
+def test_real_logs(path):
+    if not path.exists():
+        pytest.skip(f"{path} not available")
+    whole = load_tank_ct(path)
+    assert len(whole) > 0
+    chunks = pd.concat(list(iter_tank_ct(path, chunk_bytes=1 << 15)))
+    pd.testing.assert_frame_equal(chunks, whole)
+
+
+def test_follow_appended_log(tmp_path):
+    path = tmp_path / "tank.log"
+    cut = ISO_LOG.index(b"17.6455") + 3  # inside the second sample line
+    path.write_bytes(ISO_LOG[:cut])
+    buffer = TankBuffer(maxlen=100)
+    stop = asyncio.Event()
+    seen = []
+
+    async def writer():
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(buffer):
+                break
+        # the partial line waits for the rest
+        seen.append(len(buffer))
+        with path.open("ab") as f:
+            f.write(ISO_LOG[cut:])
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(buffer) == 4:
+                break
+        await asyncio.sleep(0.05)  # a couple more polls change nothing
+        stop.set()
+
+    async def run():
+        await asyncio.wait_for(asyncio.gather(
+            follow_tank_log(path, buffer, poll=0.01, stop=stop), writer()), 10)
+
+    asyncio.run(run())
+    assert seen == [1]
+    # the last sample has no newline yet, so it is still waiting
+    pd.testing.assert_frame_equal(buffer.frame(), load_tank_ct(path).iloc[:-1],
+                                  check_freq=False)
@@ -19,6 +19,8 @@ import xarray as xr
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
+from shs_notes import load_notes
+
 
 # ---------- constants (match vapo_sat.py) ---------------------------------
 RD_OVER_RV = 287.04 / 461.5
@@ -58,21 +60,7 @@ def calc_psy(t_dry: np.ndarray, t_wet: np.ndarray, p_Pa: float) -> dict:
 
 
 # ---------- IN/OUT events from 20260520_SHS-NOTES_EGH.txt ---------------
-DAY = "2026-05-20"
-NOTES = [
-    ("14:15", "start"),         # RBR & WXT logging starts
-    ("14:26", "IN"),            # SHS in water
-    ("14:33", "fan-on/OUT"),    # fan on, sensor out of water
-    ("15:07", "IN"),
-    ("15:18", "OUT"),
-    ("15:48", "IN"),
-    ("15:53", "OUT"),
-    ("17:02", "IN"),
-    ("17:08", "OUT"),
-    ("19:18", "IN"),
-    ("19:25", "OUT"),
-    ("20:59", "OFF"),
-]
+NOTES = load_notes("20260520Lab")
 
 
 def main():
@@ -90,19 +78,9 @@ def main():
 
     psy = calc_psy(Td, Tw, p_atm)
 
-    # ---- build "in-air" mask from notes ---------------------------------
-    events = [(pd.Timestamp(f"{DAY} {h}"), k) for h, k in NOTES]
-    in_air_mask = np.ones_like(Td, dtype=bool)   # sensor in air before first IN
-    state = True
-    for ts, kind in events:
-        idx = t_pd >= ts
-        if "IN" in kind and "OUT" not in kind:
-            state = False
-        elif "OUT" in kind:
-            state = True
-        elif kind == "OFF":
-            state = False
-        in_air_mask[idx] = state
+    # ---- "in-air" mask from notes -----------------------------------
+    events = [(pd.Timestamp(t), k) for t, k in zip(NOTES.times, NOTES.kinds)]
+    in_air_mask = NOTES.state_at(t_pd) == "air"  # in air before first IN
 
     # ---- per-interval summary -------------------------------------------
     print("\nMean psychrometric values for each interval defined by the notes:\n")
@@ -110,35 +88,20 @@ def main():
           f"{'Td':>6s} {'Tw':>6s} {'dep':>6s} "
           f"{'RH%':>5s} {'Tdew':>6s} {'q g/kg':>7s}")
     bounds = [t_pd[0]] + [ts for ts, _ in events] + [t_pd[-1]]
-    state = "air"
-    for i in range(len(bounds) - 1):
-        ts0, ts1 = bounds[i], bounds[i + 1]
+    states = NOTES.state_at(bounds[:-1])
+    for ts0, ts1, state in zip(bounds[:-1], bounds[1:], states):
         sel = (t_pd >= ts0) & (t_pd < ts1)
         n = int(sel.sum())
         if n == 0:
-            # advance state on the event that bounds this interval
-            pass
-        else:
-            label = f"{ts0.strftime('%H:%M')}-{ts1.strftime('%H:%M')}"
-            print(f"{label:<21s} {state:<6s} {n:5d} "
-                  f"{np.nanmean(Td[sel]):6.2f} "
-                  f"{np.nanmean(Tw[sel]):6.2f} "
-                  f"{np.nanmean(psy['depression'][sel]):6.2f} "
-                  f"{np.nanmean(psy['rh'][sel]):5.1f} "
-                  f"{np.nanmean(psy['dew'][sel]):6.2f} "
-                  f"{np.nanmean(psy['q'][sel])*1000:7.2f}")
-        # update state for next interval based on event at ts1
-        if i < len(events):
-            kind = events[i][1] if i == 0 else events[i][1]
-        # determine state for *next* interval from the event at ts1
-        if i < len(events):
-            ek = events[min(i, len(events) - 1)][1]
-            if "IN" in ek and "OUT" not in ek:
-                state = "water"
-            elif "OUT" in ek:
-                state = "air"
-            elif ek == "OFF":
-                state = "off"
+            continue
+        label = f"{ts0.strftime('%H:%M')}-{ts1.strftime('%H:%M')}"
+        print(f"{label:<21s} {state:<6s} {n:5d} "
+              f"{np.nanmean(Td[sel]):6.2f} "
+              f"{np.nanmean(Tw[sel]):6.2f} "
+              f"{np.nanmean(psy['depression'][sel]):6.2f} "
+              f"{np.nanmean(psy['rh'][sel]):5.1f} "
+              f"{np.nanmean(psy['dew'][sel]):6.2f} "
+              f"{np.nanmean(psy['q'][sel])*1000:7.2f}")
 
     # ---- save CSV ---------------------------------------------------------
     out_csv = (rbr_nc.parent / "psychrometrics_20260520.csv")
@@ -187,7 +150,7 @@ def main():
     axs[3].grid(alpha=0.4)
 
     color_for = {"IN": "tab:blue", "OUT": "tab:orange",
-                 "fan-on/OUT": "tab:red", "start": "k", "OFF": "k"}
+                 "start": "k", "OFF": "k"}
     for ts, kind in events:
         c = color_for.get(kind, "gray")
         for ax in axs:
@@ -13,6 +13,8 @@ import pandas as pd
 import xarray as xr
 
 from rbr_rsk import write_rbr_netcdf
+from segment_stats import segment_stats
+from shs_notes import load_notes
 
 
 RD_OVER_RV = 287.04 / 461.5
@@ -50,39 +52,7 @@ def calc_psy(t_dry: np.ndarray, t_wet: np.ndarray, p_Pa: float) -> dict:
     return dict(depression=depression, e=e, rh=rh, dew=dp, q=q)
 
 
-DAY = "2026-05-28"
-NOTES = [
-    ("13:08", "start/fan-on"),
-    ("13:11", "IN"),
-    ("13:27", "OUT"),
-    ("13:56", "IN"),
-    ("14:01", "OUT"),
-    ("14:56", "IN"),
-    ("15:01", "OUT"),
-    ("15:42", "IN"),
-    ("15:49", "OUT"),
-    ("16:30", "IN"),
-    ("16:34", "OUT"),
-    ("18:30", "IN"),
-    ("18:50", "OUT"),
-    ("2026-05-29 11:10", "OFF"),
-]
-
-
-def note_time(value: str) -> pd.Timestamp:
-    if value.startswith("20"):
-        return pd.Timestamp(value)
-    return pd.Timestamp(f"{DAY} {value}")
-
-
-def state_after(kind: str, current: str) -> str:
-    if "IN" in kind and "OUT" not in kind:
-        return "water"
-    if "OUT" in kind or "start" in kind:
-        return "air"
-    if kind == "OFF":
-        return "off"
-    return current
+NOTES = load_notes("20260528Lab")
 
 
 def main() -> None:
@@ -105,41 +75,24 @@ def main() -> None:
     print(f"loaded {len(t_pd)} samples, p_atm = {p_atm / 100:.2f} hPa")
 
     psy = calc_psy(Td, Tw, p_atm)
-    events = [(note_time(h), kind) for h, kind in NOTES]
-
-    in_air_mask = np.ones_like(Td, dtype=bool)
-    in_air = True
-    for ts, kind in events:
-        if "IN" in kind and "OUT" not in kind:
-            in_air = False
-        elif "OUT" in kind or "start" in kind:
-            in_air = True
-        elif kind == "OFF":
-            in_air = False
-        in_air_mask[t_pd >= ts] = in_air
+    events = [(pd.Timestamp(t), kind) for t, kind in zip(NOTES.times, NOTES.kinds)]
+    in_air_mask = NOTES.state_at(t_pd) == "air"
+    t_last = pd.Timestamp(t_pd[-1])
 
-    print("\nMean psychrometric values for each interval defined by the notes:\n")
-    print(
-        f"{'interval':<21s} {'state':<6s} {'N':>5s} "
-        f"{'Td':>6s} {'Tw':>6s} {'dep':>6s} "
-        f"{'RH%':>5s} {'Tdew':>6s} {'q g/kg':>7s}"
+    seg = NOTES.segment(t_pd)
+    stats = segment_stats(
+        seg,
+        {
+            "Td": Td,
+            "Tw": Tw,
+            "dep": psy["depression"],
+            "RH%": psy["rh"],
+            "Tdew": psy["dew"],
+            "q g/kg": psy["q"] * 1000,
+        },
     )
-
-    t_last = pd.Timestamp(t_pd[-1])
-    interval_start = pd.Timestamp(t_pd[0])
-    state = "air"
-    for ts, kind in events:
-        if ts <= interval_start:
-            state = state_after(kind, state)
-            continue
-        if ts > t_last:
-            break
-        sel = (t_pd >= interval_start) & (t_pd < ts)
-        print_interval(interval_start, ts, state, sel, Td, Tw, psy)
-        state = state_after(kind, state)
-        interval_start = ts
-    sel = t_pd >= interval_start
-    print_interval(interval_start, t_last, state, sel, Td, Tw, psy)
+    print("\nMean psychrometric values for each interval defined by the notes:\n")
+    print_intervals(stats, t_pd)
 
     out_csv = rbr_dir / "psychrometrics_20260528.csv"
     df = pd.DataFrame(
@@ -195,7 +148,7 @@ def main() -> None:
     color_for = {
         "IN": "tab:blue",
         "OUT": "tab:orange",
-        "start/fan-on": "k",
+        "start": "k",
         "OFF": "k",
     }
     for ts, kind in events:
@@ -224,28 +177,29 @@ def main() -> None:
     print(f"saved {out_png}")
 
 
-def print_interval(
-    ts0: pd.Timestamp,
-    ts1: pd.Timestamp,
-    state: str,
-    sel: np.ndarray,
-    Td: np.ndarray,
-    Tw: np.ndarray,
-    psy: dict,
-) -> None:
-    n = int(sel.sum())
-    if n == 0:
-        return
-    label = f"{ts0.strftime('%m-%d %H:%M')}-{ts1.strftime('%m-%d %H:%M')}"
+def print_intervals(stats: pd.DataFrame, t_pd: pd.DatetimeIndex) -> None:
+    """Print the per-segment means from ``segment_stats`` as one row per
+    interval between note events (segment -1 is before the first note); N is
+    the number of samples in the interval."""
+    t_first, t_last = pd.Timestamp(t_pd[0]), pd.Timestamp(t_pd[-1])
+    edges = [pd.Timestamp(t) for t in NOTES.times]
+    mean = stats.pivot(index="segment", columns="variable", values="mean")
+    length = stats.groupby("segment")["length"].first()
     print(
-        f"{label:<21s} {state:<6s} {n:5d} "
-        f"{np.nanmean(Td[sel]):6.2f} "
-        f"{np.nanmean(Tw[sel]):6.2f} "
-        f"{np.nanmean(psy['depression'][sel]):6.2f} "
-        f"{np.nanmean(psy['rh'][sel]):5.1f} "
-        f"{np.nanmean(psy['dew'][sel]):6.2f} "
-        f"{np.nanmean(psy['q'][sel]) * 1000:7.2f}"
+        f"{'interval':<21s} {'state':<6s} {'N':>5s} "
+        f"{'Td':>6s} {'Tw':>6s} {'dep':>6s} "
+        f"{'RH%':>5s} {'Tdew':>6s} {'q g/kg':>7s}"
     )
+    for i, row in mean.iterrows():
+        ts0 = max(edges[i], t_first) if i >= 0 else t_first
+        ts1 = min(edges[i + 1], t_last) if i + 1 < len(edges) else t_last
+        state = NOTES.states[i] if i >= 0 else "air"
+        label = f"{ts0.strftime('%m-%d %H:%M')}-{ts1.strftime('%m-%d %H:%M')}"
+        print(
+            f"{label:<21s} {state:<6s} {int(length[i]):5d} "
+            f"{row['Td']:6.2f} {row['Tw']:6.2f} {row['dep']:6.2f} "
+            f"{row['RH%']:5.1f} {row['Tdew']:6.2f} {row['q g/kg']:7.2f}"
+        )
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import xarray as xr
 
+from decode_wxt520_sd import load_wxt
 from rbr_rsk import write_rbr_netcdf
 
 
@@ -24,7 +25,12 @@ def main() -> None:
         print(f"wrote {RBR_NC}")
 
     ds = xr.open_dataset(RBR_NC)
-    wxt = pd.read_csv(WXT_CSV, parse_dates=["time"]).set_index("time")
+    wxt = load_wxt(
+        WXT_CSV,
+        TSTART,
+        TEND,
+        columns=["atmp", "hrh", "bpr", "compass", "tilt_x", "tilt_y"],
+    )
 
     fig, axes = plt.subplots(4, 1, figsize=(10, 12), sharex=True)
 